@@ -0,0 +1,42 @@
+"""
+Callback cost for each sample rate / block size setting: time to apply the
+setting, the first block after it (FFT plans and resonator operators are
+prepared by configure(), so it should match the steady state) and the
+steady-state mean and deadline load.
+
+Run from the repository root:  python -m benchmarks.audio_settings
+"""
+import time
+import numpy as np
+
+from src.core.synthesizer import Synthesizer
+from benchmarks.body_engines import predicted_modes
+
+DURATION = 3.0
+
+
+def main():
+    synth = Synthesizer()
+    synth.update_modes(predicted_modes())
+    synth.set_excitation_type("waveguide")
+    synth.set_sympathetic_strings(True)
+    synth.set_frequency(293.66)
+    print(f"{'rate':>6} {'block':>6} {'configure [ms]':>15} {'first [us]':>11} {'mean [us]':>10} {'load':>6}")
+    for rate in (44100, 48000, 96000):
+        for blocksize in (256, 512, 1024, 2048):
+            t0 = time.perf_counter()
+            synth.configure(rate, blocksize)
+            configure_ms = (time.perf_counter() - t0) * 1e3
+            block = np.zeros((blocksize, 1), dtype=synth.dtype)
+            t0 = time.perf_counter()
+            synth._audio_callback(block, blocksize, None, None)
+            first_us = (time.perf_counter() - t0) * 1e6
+            synth.reset_stats()
+            synth.render(DURATION, blocksize=blocksize, reset=False)
+            stats = synth.stats()
+            print(f"{rate:>6} {blocksize:>6} {configure_ms:>15.1f} {first_us:>11.0f} "
+                  f"{stats['total_us']['mean']:>10.0f} {stats['load_percent']['mean']:>5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
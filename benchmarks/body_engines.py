@@ -0,0 +1,75 @@
+"""
+Per-block cost of the body engines: FFT filtering vs. modal resonator bank
+(and the partitioned convolver for reference), for the 21 modes of
+AcousticModel.predict and for a dense FEM-sized mode set.
+
+Run from the repository root:  python -m benchmarks.body_engines
+"""
+import time
+import numpy as np
+
+from src.core.geometry import Point
+from src.core.physics import AcousticModel
+from src.core.synthesizer import Synthesizer
+from src.core.resonators import ModalResonatorBank
+from src.core.convolution import PartitionedConvolver, response_to_impulse
+
+SAMPLE_RATE = 44100
+FRAMES = 1024
+BLOCKS = 200
+
+
+def predicted_modes():
+    t = np.linspace(0, 2 * np.pi, 40, endpoint=False)
+    outline = [Point(200 + 120 * np.cos(a), 250 + 240 * np.sin(a)) for a in t]
+    return AcousticModel().predict(outline)
+
+
+def dense_modes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    freqs = np.exp(rng.uniform(np.log(150), np.log(12000), count))
+    return [{'freq': f, 'amp': rng.uniform(0.05, 1.0), 'damping': rng.uniform(0.01, 0.08)} for f in freqs]
+
+
+def time_blocks(process, source):
+    process(source[0])
+    start = time.perf_counter()
+    for block in source:
+        process(block)
+    return (time.perf_counter() - start) / len(source)
+
+
+def main():
+    synth = Synthesizer(sample_rate=SAMPLE_RATE)
+    rng = np.random.default_rng(1)
+    source = rng.standard_normal((BLOCKS, FRAMES))
+    budget = FRAMES / SAMPLE_RATE
+
+    print(f"{'modes':>6} {'engine':>12} {'design [ms]':>12} {'block [ms]':>11} {'budget':>7}")
+    for modes in (predicted_modes(), dense_modes(500), dense_modes(2000)):
+        freqs = np.fft.rfftfreq(FRAMES, 1 / SAMPLE_RATE)
+
+        t0 = time.perf_counter()
+        response = synth._compute_response(freqs, "MODEL", 0.0, 0.0, modes)
+        design = time.perf_counter() - t0
+        block = time_blocks(lambda x: np.fft.irfft(np.fft.rfft(x) * response), source)
+        print(f"{len(modes):>6} {'fft':>12} {design * 1e3:>12.2f} {block * 1e3:>11.3f} {block / budget:>7.1%}")
+
+        t0 = time.perf_counter()
+        ir_freqs = np.fft.rfftfreq(synth.ir_length, 1 / SAMPLE_RATE)
+        ir = response_to_impulse(synth._compute_response(ir_freqs, "MODEL", 0.0, 0.0, modes), synth.ir_length)
+        convolver = PartitionedConvolver(ir, synth.partition_size, FRAMES)
+        design = time.perf_counter() - t0
+        block = time_blocks(convolver.process, source)
+        print(f"{len(modes):>6} {'convolution':>12} {design * 1e3:>12.2f} {block * 1e3:>11.3f} {block / budget:>7.1%}")
+
+        t0 = time.perf_counter()
+        ops = ModalResonatorBank.design(modes, FRAMES, SAMPLE_RATE)
+        design = time.perf_counter() - t0
+        bank = ModalResonatorBank()
+        block = time_blocks(lambda x: bank.process(x, ops), source)
+        print(f"{len(modes):>6} {'modal':>12} {design * 1e3:>12.2f} {block * 1e3:>11.3f} {block / budget:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Callback time with and without session capture running, and the cost of
+the ring copy alone, for the float64 and float32 render paths. Only a
+running stream records, so the callback is driven by the paced NullBackend.
+
+Run from the repository root:  python -m benchmarks.capture_overhead
+"""
+import os
+import tempfile
+import time
+import numpy as np
+
+from src.core.backends import NullBackend
+from src.core.capture import AudioCapture
+from src.core.synthesizer import Synthesizer
+
+SAMPLE_RATE = 44100
+FRAMES = 1024
+DURATION = 10.0
+
+
+def callback_us(dtype, path=None):
+    synth = Synthesizer(sample_rate=SAMPLE_RATE, blocksize=FRAMES, dtype=dtype)
+    synth.render(0.5, 293.66)
+    synth.reset_stats()
+    if path:
+        synth.start_capture(path)
+    backend = NullBackend(realtime=True, max_blocks=int(DURATION * SAMPLE_RATE / FRAMES))
+    synth.start(backend)
+    backend.wait()
+    synth.stop()
+    synth.stop_capture()
+    total = synth.stats()["total_us"]
+    return total["mean"], total["p99"]
+
+
+def ring_copy_us(dtype, path):
+    capture = AudioCapture(path, SAMPLE_RATE, dtype=dtype)
+    block = np.random.default_rng(0).uniform(-0.5, 0.5, FRAMES).astype(dtype)
+    n = 2000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        capture.write(block)
+    elapsed = time.perf_counter() - t0
+    capture.close()
+    return elapsed / n * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "capture.wav")
+        print(f"{'dtype':>8} {'off mean/p99 [us]':>18} {'on mean/p99 [us]':>17} {'ring copy [us]':>15}")
+        for dtype in (np.float64, np.float32):
+            off = callback_us(dtype)
+            on = callback_us(dtype, path)
+            copy = ring_copy_us(dtype, path)
+            name = np.dtype(dtype).name
+            print(f"{name:>8} {off[0]:>9.0f}/{off[1]:<8.0f} {on[0]:>8.0f}/{on[1]:<8.0f} {copy:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Closed-form body impulse response: build time and peak memory against
+the number of modes, the length and the sample rate, and the cost of a
+cache hit.
+
+Run from the repository root:  python -m benchmarks.impulse_response
+"""
+import time
+import tracemalloc
+import numpy as np
+
+from src.core.impulse import modal_impulse_response
+from benchmarks.body_engines import predicted_modes
+
+
+def random_modes(n, rng):
+    return [{'freq': f, 'amp': 1.0, 'damping': 0.005} for f in rng.uniform(80.0, 12000.0, n)]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'modes':>6} {'rate':>6} {'IR [s]':>7} {'build [ms]':>11} {'peak [MB]':>10} {'cached [us]':>12}")
+    for modes in (predicted_modes(), random_modes(2000, rng)):
+        for rate in (44100, 96000):
+            for seconds in (1.0, 6.0):
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                modal_impulse_response(modes, rate, seconds)
+                build = time.perf_counter() - t0
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                t0 = time.perf_counter()
+                modal_impulse_response(modes, rate, seconds)
+                cached = time.perf_counter() - t0
+                print(f"{len(modes):>6} {rate:>6} {seconds:>7.1f} {build * 1e3:>11.1f} {peak / 2**20:>10.1f} "
+                      f"{cached * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
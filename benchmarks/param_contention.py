@@ -0,0 +1,131 @@
+"""
+Stress test for the parameter snapshot exchange: one thread hammers the
+Synthesizer setters (as slider drags do) while another drives the audio
+callback at real-time pace. The writer lock is wrapped so that any
+acquisition from the audio thread is counted as a blocked callback, and
+body response builds are counted per thread: the second run hammers
+update_modes with 500 modes and must not rebuild on the audio thread.
+
+Run from the repository root:  python -m benchmarks.param_contention
+"""
+import threading
+import time
+import numpy as np
+
+from src.core.synthesizer import Synthesizer
+
+DURATION = 5.0
+FRAMES = 1024
+# Pause between setter bursts; 1 kHz is far beyond any slider drag rate.
+# Set to 0 to hammer flat out (the callback then mostly measures GIL sharing).
+HAMMER_INTERVAL = 0.001
+# Pause between material updates (each one rebuilds a 500-mode body response)
+MATERIAL_INTERVAL = 0.05
+
+
+class CountingLock:
+    """Lock wrapper that counts acquisitions per thread."""
+    def __init__(self, lock):
+        self._lock = lock
+        self.acquired_by = {}
+
+    def __enter__(self):
+        ident = threading.get_ident()
+        self.acquired_by[ident] = self.acquired_by.get(ident, 0) + 1
+        return self._lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self._lock.__exit__(*exc)
+
+
+def setter_burst(synth, rng, i):
+    """Slider drags: pitch, bow and excitation changes, and a body response change every 50 bursts."""
+    synth.set_frequency(float(rng.uniform(196, 660)))
+    synth.set_bow_params(float(rng.uniform(0, 1)), float(rng.uniform(0, 1)))
+    synth.set_excitation_type(("sawtooth", "waveguide")[i % 2])
+    if i % 50 == 0:
+        synth.set_noise_level(float(rng.uniform(0, 0.5)))
+    return 3 + (i % 50 == 0)
+
+
+def material_burst(synth, rng, i):
+    """Material slider ticks: a new 500-mode set, rebuilding the body response each time."""
+    scale = float(rng.uniform(0.9, 1.1))
+    synth.update_modes([{'freq': f * scale, 'amp': 1.0, 'damping': 0.05} for f in MATERIAL_MODES])
+    return 1
+
+
+MATERIAL_MODES = np.linspace(200, 12000, 500)
+
+
+def run(burst, interval):
+    synth = Synthesizer()
+    synth.update_modes([{'freq': f, 'amp': 1.0, 'damping': 0.05} for f in np.linspace(300, 8000, 21)])
+    lock = CountingLock(synth.lock)
+    synth.lock = lock
+
+    # Body responses built on the audio thread (the snapshot should always carry one)
+    build_response = synth._build_response
+    builds_by = {}
+
+    def counting_build(p, frames):
+        ident = threading.get_ident()
+        builds_by[ident] = builds_by.get(ident, 0) + 1
+        return build_response(p, frames)
+    synth._build_response = counting_build
+
+    stop = threading.Event()
+    setter_calls = [0]
+
+    def hammer():
+        rng = np.random.default_rng(0)
+        i = 0
+        while not stop.is_set():
+            setter_calls[0] += burst(synth, rng, i)
+            i += 1
+            if interval:
+                time.sleep(interval)
+
+    durations = []
+    audio_ident = [None]
+
+    def audio():
+        audio_ident[0] = threading.get_ident()
+        out = np.zeros((FRAMES, 1))
+        period = FRAMES / synth.sample_rate
+        deadline = time.perf_counter()
+        end = deadline + DURATION
+        while deadline < end:
+            t0 = time.perf_counter()
+            synth._audio_callback(out, FRAMES, None, None)
+            durations.append(time.perf_counter() - t0)
+            deadline += period
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+
+    writer = threading.Thread(target=hammer)
+    player = threading.Thread(target=audio)
+    writer.start()
+    player.start()
+    player.join()
+    stop.set()
+    writer.join()
+
+    d = np.array(durations) * 1e3
+    period_ms = FRAMES / synth.sample_rate * 1e3
+    print(f"setter calls:        {setter_calls[0]}")
+    print(f"callbacks:           {len(d)}")
+    print(f"blocked callbacks:   {lock.acquired_by.get(audio_ident[0], 0)}")
+    print(f"audio-thread body rebuilds: {builds_by.get(audio_ident[0], 0)}")
+    print(f"callback p50/p99/max [ms]: {np.median(d):.3f} / {np.percentile(d, 99):.3f} / {d.max():.3f}")
+    print(f"deadline misses:     {int(np.sum(d > period_ms))} (deadline {period_ms:.1f} ms)")
+
+
+def main():
+    print("-- setters --")
+    run(setter_burst, HAMMER_INTERVAL)
+    print("-- update_modes (500 modes) --")
+    run(material_burst, MATERIAL_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()
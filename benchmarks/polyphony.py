@@ -0,0 +1,37 @@
+"""
+Per-block cost of chords on the voice pool: the excitation grows with the
+voice count while the body filter runs once on the mix.
+
+Run from the repository root:  python -m benchmarks.polyphony
+"""
+from src.core.synthesizer import Synthesizer
+from benchmarks.body_engines import predicted_modes
+
+SAMPLE_RATE = 44100
+FRAMES = 1024
+DURATION = 3.0
+# G3 D4 A4 E5 and the octave above
+CHORD = (196.0, 293.66, 440.0, 659.25, 392.0, 587.33, 880.0, 1318.5)
+
+
+def main():
+    modes = predicted_modes()
+    budget_us = FRAMES / SAMPLE_RATE * 1e6
+    print(f"{'excitation':>10} {'voices':>6} {'excit. [us]':>11} {'body [us]':>10} {'total [us]':>10} {'budget':>7}")
+    for excitation in ("sawtooth", "waveguide"):
+        for n in (1, 2, 4, 8):
+            synth = Synthesizer(sample_rate=SAMPLE_RATE)
+            synth.update_modes(modes)
+            synth.set_excitation_type(excitation)
+            synth.set_chord(CHORD[:n])
+            synth.render(0.5, blocksize=FRAMES)
+            synth.reset_stats()
+            synth.render(DURATION, blocksize=FRAMES)
+            st = synth.stats()
+            total = st["total_us"]["mean"]
+            print(f"{excitation:>10} {n:>6} {st['stages_us']['excitation']['mean']:>11.0f} "
+                  f"{st['stages_us']['body']['mean']:>10.0f} {total:>10.0f} {total / budget_us:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
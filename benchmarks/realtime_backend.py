@@ -0,0 +1,38 @@
+"""
+Real-time scheduling, latency and drop behaviour of the full callback on
+the headless NullBackend (no sound card needed).
+
+Run from the repository root:  python -m benchmarks.realtime_backend [seconds]
+"""
+import sys
+import numpy as np
+
+from src.core.synthesizer import Synthesizer
+from src.core.backends import NullBackend
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    modes = [{'freq': f, 'amp': 1.0, 'damping': 0.05} for f in np.geomspace(300, 8000, 21)]
+
+    print(f"{'excitation':>10} {'engine':>12} {'blocks':>7} {'drops':>6} {'wake p99 [ms]':>14} {'load p99':>9} {'load max':>9}")
+    for excitation in ("sawtooth", "waveguide", "fdtd"):
+        for engine in ("fft", "convolution", "modal"):
+            synth = Synthesizer()
+            synth.update_modes(modes)
+            synth.set_excitation_type(excitation)
+            synth.set_body_engine(engine)
+
+            blocks = int(seconds * synth.sample_rate / synth.blocksize)
+            backend = NullBackend(realtime=True, max_blocks=blocks)
+            synth.start(backend)
+            backend.wait()
+            synth.stop()
+
+            load = synth.stats()["load_percent"]
+            print(f"{excitation:>10} {engine:>12} {backend.blocks:>7} {backend.dropped_blocks:>6} "
+                  f"{backend.lateness_us.percentile(99) / 1000.0:>14.2f} {load['p99']:>8.1f}% {load['max']:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
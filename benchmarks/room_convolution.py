@@ -0,0 +1,55 @@
+"""
+Audio-thread cost per block of the room stage for 1-6 s impulse responses:
+the two-stage RoomConvolver (head in the callback, tail on a worker) against
+a single uniformly partitioned convolver over the whole response, plus the
+number of blocks with a missing tail in a real-time stream.
+
+Run from the repository root:  python -m benchmarks.room_convolution
+"""
+import time
+import numpy as np
+
+from src.core.convolution import PartitionedConvolver
+from src.core.room import RoomConvolver
+
+SAMPLE_RATE = 44100
+FRAMES = 256
+BLOCKS = 800
+
+
+def synthetic_ir(seconds, rng):
+    n = int(seconds * SAMPLE_RATE)
+    return rng.standard_normal(n) * np.exp(-np.arange(n) / (0.4 * seconds * SAMPLE_RATE))
+
+
+def per_block_us(convolver, x):
+    times = []
+    for i in range(BLOCKS):
+        block = x[i * FRAMES:(i + 1) * FRAMES]
+        t0 = time.perf_counter()
+        convolver.process(block)
+        times.append(time.perf_counter() - t0)
+        # Pace the stream like a sound card so the worker has the block period to finish
+        time.sleep(max(0.0, FRAMES / SAMPLE_RATE - times[-1]))
+    times = np.array(times[BLOCKS // 10:]) * 1e6
+    return np.mean(times), np.percentile(times, 99)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(BLOCKS * FRAMES).astype(np.float32)
+    budget_us = FRAMES / SAMPLE_RATE * 1e6
+    print(f"block {FRAMES} frames, period {budget_us:.0f} us")
+    print(f"{'IR [s]':>6} {'uniform [us]':>13} {'p99':>7} {'room [us]':>10} {'p99':>7} {'tail misses':>12}")
+    for seconds in (1.0, 3.0, 6.0):
+        ir = synthetic_ir(seconds, rng)
+        uniform = PartitionedConvolver(ir, FRAMES, FRAMES, np.float32)
+        room = RoomConvolver(ir, FRAMES, block_size=FRAMES, dtype=np.float32)
+        u_mean, u_p99 = per_block_us(uniform, x)
+        r_mean, r_p99 = per_block_us(room, x)
+        print(f"{seconds:>6.1f} {u_mean:>13.0f} {u_p99:>7.0f} {r_mean:>10.0f} {r_p99:>7.0f} {room.tail_misses:>12}")
+        room.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+AcousticModel.calculate_spectrum: the broadcast (modes x frequencies)
+evaluation against the original per-mode loop, for the 21 predicted modes
+and for 2000 dense modes, with the largest SPL difference between them.
+Also times repeated calls where only the materials change (the grid and
+the mode table buffers are reused).
+
+Run from the repository root:  python -m benchmarks.spectrum
+"""
+import time
+import numpy as np
+
+from src.core.physics import AcousticModel
+from benchmarks.body_engines import predicted_modes, dense_modes
+
+REPEATS = 20
+
+
+def loop_spectrum(modes, f_min=100, f_max=10000, n_points=1200):
+    """The previous implementation: one full-length complex division per mode (MODEL mode, no smoothing)."""
+    freqs = np.linspace(f_min, f_max, n_points)
+    response = np.zeros_like(freqs, dtype=complex)
+    f_hpf = 200.0
+    response += 0.05 * (freqs / f_hpf)**2 / (1 + (freqs / f_hpf)**2 + 1e-6)
+    for mode_data in modes:
+        f0 = mode_data['freq']
+        gamma = mode_data['damping'] * f0
+        response += mode_data['amp'] * f0**2 / ((f0**2 - freqs**2) + 1j * gamma * freqs)
+    magnitude = np.abs(response)
+    f_rad = 400.0
+    magnitude *= (freqs / f_rad)**3 / (1 + (freqs / f_rad)**3)
+    return freqs, 20 * np.log10(np.maximum(magnitude, 1e-9))
+
+
+def best_time(fn):
+    fn()
+    times = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    model = AcousticModel()
+    print(f"{'modes':>6} {'points':>7} {'loop [ms]':>10} {'broadcast [ms]':>15} {'speedup':>8} {'max |dB diff|':>14}")
+    for modes in (predicted_modes(), dense_modes(2000)):
+        for n_points in (1200, 8192):
+            loop = best_time(lambda: loop_spectrum(modes, n_points=n_points))
+            fast = best_time(lambda: model.calculate_spectrum(modes, n_points=n_points))
+            diff = np.max(np.abs(loop_spectrum(modes, n_points=n_points)[1]
+                                 - model.calculate_spectrum(modes, n_points=n_points)[1]))
+            print(f"{len(modes):>6} {n_points:>7} {loop * 1e3:>10.2f} {fast * 1e3:>15.2f} {loop / fast:>7.1f}x {diff:>14.2e}")
+
+    # Material edits: new mode frequencies, same grid and mode count
+    modes = predicted_modes()
+    scales = np.linspace(0.9, 1.1, REPEATS)
+    t0 = time.perf_counter()
+    for scale in scales:
+        model.calculate_spectrum([dict(m, freq=m['freq'] * scale) for m in modes])
+    per_call = (time.perf_counter() - t0) / REPEATS
+    print(f"material sweep ({len(modes)} modes): {per_call * 1e3:.2f} ms per spectrum")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Callback cost of the sympathetic-string bank (35 string modes) on top of
+each excitation model, as a fraction of the callback time without it and
+of the block period.
+
+Measured (44.1 kHz, 1024 frames, one core): the bank takes about 70-120 us
+per block, 0.3-0.5% of the block period. That is 8-9% on top of the
+waveguide callback, 15-17% on top of FDTD and 25-30% on top of sawtooth,
+whose whole callback takes only about 300 us. Its cost is a fixed handful of NumPy calls per block: with 17,
+23 or 35 modes (max_freq 1.5, 2 or 3 kHz) it measures the same, so fewer
+partials do not make it cheaper.
+
+Run from the repository root:  python -m benchmarks.sympathetic_strings
+"""
+from src.core.synthesizer import Synthesizer
+from benchmarks.body_engines import predicted_modes
+
+SAMPLE_RATE = 44100
+FRAMES = 1024
+DURATION = 5.0
+
+
+def callback_time(excitation, sympathetic, modes):
+    synth = Synthesizer(sample_rate=SAMPLE_RATE)
+    synth.update_modes(modes)
+    synth.set_excitation_type(excitation)
+    synth.set_sympathetic_strings(sympathetic)
+    synth.render(0.5, 293.66, blocksize=FRAMES)
+    synth.reset_stats()
+    synth.render(DURATION, 293.66, blocksize=FRAMES)
+    stats = synth.stats()
+    return stats["total_us"]["mean"], stats["stages_us"]["sympathetic"]["mean"]
+
+
+def main():
+    modes = predicted_modes()
+    budget_us = FRAMES / SAMPLE_RATE * 1e6
+    print(f"{'excitation':>10} {'off [us]':>9} {'on [us]':>9} {'bank [us]':>10} {'overhead':>9} {'budget':>7}")
+    for excitation in ("sawtooth", "waveguide", "fdtd"):
+        off, _ = callback_time(excitation, False, modes)
+        on, bank = callback_time(excitation, True, modes)
+        print(f"{excitation:>10} {off:>9.0f} {on:>9.0f} {bank:>10.0f} {bank / off:>9.1%} {bank / budget_us:>7.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable
+
+import numpy as np
+
+from .instrumentation import LatencyHistogram
+from .wavio import WavWriter
+
+
+class AudioBackend(ABC):
+    """
+    Drives a sounddevice-style callback(outdata, frames, time_info, status)
+    block by block.
+    """
+    # Whether stop() + start() continues the same output (Synthesizer.configure restarts streams)
+    restartable = True
+
+    @abstractmethod
+    def start(self, callback: Callable, sample_rate: int, blocksize: int, channels: int = 1):
+        pass
+
+    @abstractmethod
+    def stop(self):
+        pass
+
+
+class SoundDeviceBackend(AudioBackend):
+    """Real output through a sounddevice (PortAudio) stream."""
+    def __init__(self, device=None):
+        self.device = device
+        self.stream = None
+
+    def start(self, callback, sample_rate, blocksize, channels=1):
+        import sounddevice as sd
+        self.stream = sd.OutputStream(
+            device=self.device,
+            channels=channels,
+            callback=callback,
+            samplerate=sample_rate,
+            dtype='float32',
+            blocksize=blocksize
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+class BackendStatus:
+    """Stand-in for sounddevice.CallbackFlags."""
+    def __init__(self):
+        self.output_underflow = False
+        self.output_overflow = False
+        self.priming_output = False
+
+    def __bool__(self):
+        return self.output_underflow or self.output_overflow or self.priming_output
+
+
+class NullBackend(AudioBackend):
+    """
+    Headless backend: a timer thread calls the callback either at real-time
+    pace (realtime=True, like a sound card would) or back to back as fast as
+    possible. Output blocks are handed to `sink` (or discarded).
+
+    In real-time mode a block that is finished after its playback deadline
+    counts as a drop and the next callback sees output_underflow, as with
+    PortAudio. Wake-up lateness is kept in `lateness_us`.
+    """
+    def __init__(self, realtime: bool = True, sink: Callable = None, max_blocks: int = None):
+        self.realtime = realtime
+        self.sink = sink
+        self.max_blocks = max_blocks
+        self.blocks = 0
+        self.dropped_blocks = 0
+        self.lateness_us = LatencyHistogram()
+        self._thread = None
+        self._stop = threading.Event()
+        self.finished = threading.Event()
+
+    def start(self, callback, sample_rate, blocksize, channels=1):
+        self._stop.clear()
+        self.finished.clear()
+        self.blocks = 0
+        self.dropped_blocks = 0
+        self._thread = threading.Thread(target=self._run, args=(callback, sample_rate, blocksize, channels), daemon=True)
+        self._thread.start()
+
+    def _run(self, callback, sample_rate, blocksize, channels):
+        # Same sample format a sounddevice stream hands the callback
+        outdata = np.zeros((blocksize, channels), dtype=np.float32)
+        status = BackendStatus()
+        period = blocksize / sample_rate
+        next_t = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                if self.max_blocks is not None and self.blocks >= self.max_blocks:
+                    break
+                if self.realtime:
+                    delay = next_t - time.perf_counter()
+                    if delay > 0:
+                        self._stop.wait(delay)
+                    self.lateness_us.record(max(0.0, time.perf_counter() - next_t) * 1e6)
+
+                callback(outdata, blocksize, None, status)
+                status.output_underflow = False
+                self.blocks += 1
+                if self.sink is not None:
+                    self.sink(outdata)
+
+                next_t += period
+                if self.realtime and time.perf_counter() > next_t:
+                    # Block finished after the device would have needed it
+                    self.dropped_blocks += 1
+                    status.output_underflow = True
+                    next_t = time.perf_counter()
+        finally:
+            self.finished.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits until max_blocks have been played (or the backend was stopped)."""
+        return self.finished.wait(timeout)
+
+
+class WavFileBackend(NullBackend):
+    """Null backend whose sink streams the output to a WAV file (start() truncates it, so no restarts)."""
+    restartable = False
+    def __init__(self, path: str, realtime: bool = False, max_blocks: int = None):
+        super().__init__(realtime=realtime, sink=self._write, max_blocks=max_blocks)
+        self.path = path
+        self.writer = None
+
+    def start(self, callback, sample_rate, blocksize, channels=1):
+        self.writer = WavWriter(self.path, sample_rate, channels)
+        super().start(callback, sample_rate, blocksize, channels)
+
+    def _write(self, outdata):
+        self.writer.write(outdata.reshape(-1))
+
+    def stop(self):
+        super().stop()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -0,0 +1,154 @@
+"""
+Batch rendering of many plate designs in parallel.
+
+A design file uses the same layout as geometry_default.json (normalized
+"outline" and "arching" templates as saved by the canvases) plus optional
+"materials" with top/back density (kg/m3) and modulus (GPa). For every
+design an audio clip (WAV) and its SPL curve (CSV) are written to the
+output directory, together with a summary.json.
+
+Usage:  python -m src.core.batch designs/*.json -o renders/
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict
+
+import numpy as np
+
+from .geometry import Point
+from .physics import AcousticModel
+from .synthesizer import Synthesizer
+
+# Scene rectangle the canvases lay their templates into
+SCENE_RECT = (0.0, 0.0, 400.0, 800.0)
+ARCH_DEPTH = 40.0
+RIB_THICKNESS = 35.0
+
+DEFAULT_MATERIALS = {"top_density": 400.0, "top_modulus": 12.0, "back_density": 600.0, "back_modulus": 10.0}
+
+# Per-process models, created once by the pool initializer so spl.csv and
+# the other shared data are not reloaded for every job
+_worker = {}
+
+
+def load_design(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def design_points(design: Dict):
+    """Lays the normalized templates out in scene coordinates, as Canvas/ArchingCanvas do."""
+    x, top, w, h = SCENE_RECT
+    cx = x + w / 2.0
+
+    outline = [Point(cx + item[0] * (w / 2.0), top + item[1] * h) for item in design["outline"]]
+
+    top_pts, back_pts = None, None
+    arching = design.get("arching")
+    if arching:
+        arch_depth = min(ARCH_DEPTH, w)
+        cx_top = cx - RIB_THICKNESS / 2.0
+        cx_back = cx + RIB_THICKNESS / 2.0
+        top_pts = [Point(cx_top - v * arch_depth, top + u * h) for u, v in arching["top"]]
+        back_pts = [Point(cx_back + v * arch_depth, top + u * h) for u, v in arching["back"]]
+    return outline, top_pts, back_pts
+
+
+def _init_worker(sample_rate: int):
+    _worker["physics"] = AcousticModel()
+    _worker["synth"] = Synthesizer(sample_rate=sample_rate)
+
+
+def _render_job(job: Dict) -> Dict:
+    physics = _worker["physics"]
+    synth = _worker["synth"]
+
+    design = load_design(job["path"])
+    outline, top_pts, back_pts = design_points(design)
+
+    materials = dict(DEFAULT_MATERIALS, **design.get("materials", {}))
+    physics.set_material_properties(materials["top_density"], materials["top_modulus"],
+                                    materials["back_density"], materials["back_modulus"])
+    physics.arching_data = None
+    if top_pts and back_pts:
+        physics.update_arching(top_pts, back_pts)
+    physics.update_geometry(outline)
+
+    modes = physics.predict()
+    freqs, spl_db = physics.calculate_spectrum(modes, mode=job["response_mode"])
+
+    name = job["name"]
+    wav_path = os.path.join(job["out_dir"], f"{name}.wav")
+    spl_path = os.path.join(job["out_dir"], f"{name}_spl.csv")
+
+    synth.set_excitation_type(job["excitation"])
+    synth.set_response_mode(job["response_mode"])
+    synth.update_modes(modes)
+    synth.render(job["duration"], job["note"], wav_path=wav_path)
+
+    np.savetxt(spl_path, np.column_stack([freqs, spl_db]), delimiter=',', header="freq_hz,spl_db", comments='')
+
+    return {"design": job["path"], "wav": wav_path, "spl": spl_path, "modes": len(modes),
+            "materials": materials}
+
+
+def output_names(design_paths: List[str]) -> List[str]:
+    """
+    Output file stem per design: the file name, with _2, _3, ... appended
+    (in input order) when designs in different directories share a name.
+    """
+    stems = [os.path.splitext(os.path.basename(p))[0] for p in design_paths]
+    taken = set(stems)
+    seen = {}
+    names = []
+    for stem in stems:
+        seen[stem] = seen.get(stem, 0) + 1
+        name = stem
+        if seen[stem] > 1:
+            n = seen[stem]
+            while f"{stem}_{n}" in taken:
+                n += 1
+            name = f"{stem}_{n}"
+            taken.add(name)
+        names.append(name)
+    return names
+
+
+def render_designs(design_paths: List[str], out_dir: str, duration: float = 2.0, note=196.0,
+                   excitation: str = "sawtooth", response_mode: str = "MODEL",
+                   sample_rate: int = 44100, workers: int = None) -> List[Dict]:
+    """Renders every design on a pool of worker processes (one per core by default)."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [{"path": p, "name": name, "out_dir": out_dir, "duration": duration, "note": note,
+             "excitation": excitation, "response_mode": response_mode}
+            for p, name in zip(design_paths, output_names(design_paths))]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sample_rate,)) as pool:
+        results = list(pool.map(_render_job, jobs))
+
+    with open(os.path.join(out_dir, "summary.json"), 'w') as f:
+        json.dump(results, f, indent=4)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render audio clips and SPL curves for many designs.")
+    parser.add_argument("designs", nargs="+", help="Design JSON files (outline + arching + materials)")
+    parser.add_argument("-o", "--out-dir", default="renders")
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--note", type=float, default=196.0)
+    parser.add_argument("--excitation", default="sawtooth", choices=["sawtooth", "waveguide", "fdtd"])
+    parser.add_argument("--response-mode", default="MODEL", choices=["FLAT", "MODEL", "SAMPLED", "NOISY"])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    results = render_designs(args.designs, args.out_dir, args.duration, args.note,
+                             args.excitation, args.response_mode, workers=args.workers)
+    for r in results:
+        print(f"{r['design']}: {r['modes']} modes -> {r['wav']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import threading
+import numpy as np
+
+from .ringbuffer import AudioRingBuffer
+from .wavio import WavWriter
+
+
+class AudioCapture:
+    """
+    Records the synthesizer output to a WAV (16-bit) or FLAC file while it plays.
+    The audio thread only copies each block into a preallocated ring
+    (`write`); a writer thread wakes every `write_interval` seconds and
+    drains everything collected so far in one large sequential write. If
+    the writer falls more than `buffer_seconds` behind, the oldest samples
+    are lost: they are written as silence, so the file keeps its timing,
+    and counted in `dropped` / `overflows`. If writing fails (disk full,
+    encoder error) the writer stops and keeps the exception in `error`;
+    the audio thread keeps filling the ring until close().
+    """
+    def __init__(self, path: str, sample_rate: int, buffer_seconds: float = 8.0, write_interval: float = 0.5,
+                 dtype=np.float32):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.write_interval = write_interval
+        self.ring = AudioRingBuffer(int(buffer_seconds * sample_rate), dtype)
+        self.frames_written = 0
+        self.dropped = 0        # samples lost to ring overflows
+        self.overflows = 0      # drains that found lost samples
+        self.error = None       # exception that stopped the writer thread
+        # Open the file here so a bad path or a missing FLAC encoder fails in the caller
+        if os.path.splitext(path)[1].lower() == ".flac":
+            import soundfile as sf
+            self.writer = sf.SoundFile(path, 'w', samplerate=int(sample_rate), channels=1, format='FLAC', subtype='PCM_16')
+        else:
+            self.writer = WavWriter(path, sample_rate)
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def write(self, samples: np.ndarray):
+        """Audio thread: copies one output block into the ring."""
+        self.ring.write(samples)
+
+    def _run(self):
+        try:
+            while not self.stopping.wait(self.write_interval):
+                self._drain()
+            self._drain()
+        except Exception as e:
+            self.error = e
+
+    def _drain(self):
+        samples, lost = self.ring.read()
+        if lost:
+            self.dropped += lost
+            self.overflows += 1
+            self.writer.write(np.zeros(lost, dtype=samples.dtype))
+        if len(samples):
+            self.writer.write(samples)
+        self.frames_written += lost + len(samples)
+
+    @property
+    def seconds(self) -> float:
+        return self.frames_written / self.sample_rate
+
+    def close(self):
+        """
+        Stops the writer after it has written everything captured so far
+        and closes the file (also after a write error, see `error`).
+        """
+        self.stopping.set()
+        self.thread.join()
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+            self.writer = None
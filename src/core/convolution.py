@@ -0,0 +1,140 @@
+import numpy as np
+
+from . import fft
+
+
+def response_to_impulse(response: np.ndarray, n: int) -> np.ndarray:
+    """
+    Converts a body response sampled on fft.rfftfreq(n) into a causal
+    impulse response of length n. Only the magnitude is kept; the phase is
+    rebuilt as minimum phase (folded real cepstrum), so FLAT/SAMPLED
+    magnitude curves get a causal filter just like the modal response.
+    """
+    log_mag = np.log(np.maximum(np.abs(response), 1e-12))
+    cepstrum = fft.irfft(log_mag, n)
+
+    fold = np.zeros(n)
+    fold[0] = 1.0
+    fold[1:(n + 1) // 2] = 2.0
+    if n % 2 == 0:
+        fold[n // 2] = 1.0
+
+    min_phase = np.exp(fft.rfft(cepstrum * fold))
+    return fft.irfft(min_phase, n)
+
+
+class PartitionedConvolver:
+    """
+    Uniformly partitioned overlap-save convolution.
+    The impulse response is split into partitions of `partition_size`
+    samples whose spectra (FFT size 2 * partition_size) are multiplied
+    against a frequency-domain delay line of past input spectra, so the
+    FFT size and latency do not depend on the impulse response length.
+
+    If every processed block is a multiple of the partition size (pass the
+    stream's `block_size`), the convolver adds no latency. Otherwise it
+    buffers one partition and `latency` equals `partition_size`; a block
+    that breaks the multiple-of rule switches it to buffering until the
+    next reset().
+
+    All buffers are allocated once in `dtype` (float32 runs the FFTs and the
+    spectral products in single precision); only a change of the partition
+    count reallocates the delay line.
+    """
+    def __init__(self, impulse_response: np.ndarray, partition_size: int = 256, block_size: int = None, dtype=np.float64):
+        self.partition_size = partition_size
+        self.base_latency = 0 if block_size and block_size % partition_size == 0 else partition_size
+        self.latency = self.base_latency
+        self.dtype = np.dtype(dtype)
+        self.complex_dtype = np.result_type(self.dtype, np.complex64)
+
+        P = partition_size
+        self.spectra = self.partition_spectra(impulse_response, P, self.dtype)
+        self.n_partitions = len(self.spectra)
+
+        # Frequency-domain delay line, mirrored so the last K spectra are
+        # always one contiguous slice (oldest first)
+        self.fdl = np.zeros((2 * self.n_partitions, P + 1), dtype=self.complex_dtype)
+        self.fdl_pos = 0
+
+        self.in_buf = np.zeros(2 * P, dtype=self.dtype)
+        self.out_buf = np.zeros(P, dtype=self.dtype)
+        self.fill = 0
+        # FFT work buffers
+        self.acc = np.zeros(P + 1, dtype=self.complex_dtype)
+        self.time_buf = np.zeros(2 * P, dtype=self.dtype)
+
+    @staticmethod
+    def partition_spectra(impulse_response: np.ndarray, partition_size: int, dtype=np.float64) -> np.ndarray:
+        """Spectra of the impulse response partitions, newest-input partition last."""
+        P = partition_size
+        n_partitions = max(1, int(np.ceil(len(impulse_response) / P)))
+        padded = np.zeros(n_partitions * P, dtype=dtype)
+        padded[:len(impulse_response)] = impulse_response
+        spectra = fft.rfft(padded.reshape(n_partitions, P), 2 * P, axis=1)
+        return spectra[::-1].copy()
+
+    def set_spectra(self, spectra: np.ndarray):
+        """
+        Swaps in new partition spectra (see partition_spectra) without
+        clearing the input history, so response changes do not click.
+        """
+        if spectra is self.spectra:
+            return
+        if len(spectra) != self.n_partitions:
+            self.n_partitions = len(spectra)
+            self.fdl = np.zeros((2 * self.n_partitions, self.partition_size + 1), dtype=self.complex_dtype)
+            self.fdl_pos = 0
+        self.spectra = spectra
+
+    def _process_partition(self) -> np.ndarray:
+        P = self.partition_size
+        K = self.n_partitions
+
+        pos = self.fdl_pos
+        X = fft.rfft(self.in_buf, out=self.fdl[pos])
+        self.fdl[pos + K] = X
+        self.fdl_pos = (pos + 1) % K
+
+        history = self.fdl[pos + 1:pos + 1 + K]
+        np.einsum('kf,kf->f', history, self.spectra, out=self.acc)
+
+        # Slide the overlap-save input window
+        self.in_buf[:P] = self.in_buf[P:]
+        return fft.irfft(self.acc, 2 * P, out=self.time_buf)[P:]
+
+    def process(self, x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        P = self.partition_size
+        n = len(x)
+        if out is None:
+            out = np.empty(n, dtype=self.dtype)
+
+        if self.latency == 0 and n % P:
+            self.latency = P
+            self.out_buf[:] = 0.0
+
+        if self.latency == 0:
+            for start in range(0, n, P):
+                self.in_buf[P:] = x[start:start + P]
+                out[start:start + P] = self._process_partition()
+            return out
+
+        i = 0
+        while i < n:
+            take = min(P - self.fill, n - i)
+            out[i:i + take] = self.out_buf[self.fill:self.fill + take]
+            self.in_buf[P + self.fill:P + self.fill + take] = x[i:i + take]
+            self.fill += take
+            i += take
+            if self.fill == P:
+                self.out_buf[:] = self._process_partition()
+                self.fill = 0
+        return out
+
+    def reset(self):
+        self.latency = self.base_latency
+        self.fdl[:] = 0.0
+        self.fdl_pos = 0
+        self.in_buf[:] = 0.0
+        self.out_buf[:] = 0.0
+        self.fill = 0
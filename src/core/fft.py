@@ -0,0 +1,64 @@
+import os
+from typing import Iterable
+
+import numpy as np
+import scipy.fft
+
+# Threads for batched transforms (2-D input, one transform per row). Single
+# blocks always run on the calling thread: pocketfft only parallelizes
+# across rows, and a thread hand-off costs more than a 1024-point FFT.
+WORKERS = os.cpu_count() or 1
+
+
+def _workers(x: np.ndarray) -> int:
+    return WORKERS if np.ndim(x) > 1 else 1
+
+
+def _has_out() -> bool:
+    try:
+        np.fft.rfft(np.zeros(2), out=np.zeros(2, dtype=np.complex128))
+    except TypeError:
+        return False
+    return True
+
+
+# numpy.fft only takes `out` from numpy 2.0; older versions transform and copy.
+HAS_OUT = _has_out()
+
+
+def rfft(x: np.ndarray, n: int = None, axis: int = -1, out: np.ndarray = None) -> np.ndarray:
+    """
+    scipy.fft.rfft (single precision stays single precision). Plans and
+    twiddle factors live in pocketfft's per-size cache, so only the first
+    transform of a new size plans. With `out`, numpy.fft (numpy 2) writes
+    the result straight into it, so per-block transforms on the audio
+    thread do not allocate; on numpy 1.x the result is copied into `out`.
+    """
+    if out is not None:
+        if HAS_OUT:
+            return np.fft.rfft(x, n, axis=axis, out=out)
+        out[...] = scipy.fft.rfft(x, n, axis=axis)
+        return out
+    return scipy.fft.rfft(x, n, axis=axis, workers=_workers(x))
+
+
+def irfft(x: np.ndarray, n: int = None, axis: int = -1, out: np.ndarray = None) -> np.ndarray:
+    if out is not None:
+        if HAS_OUT:
+            return np.fft.irfft(x, n, axis=axis, out=out)
+        out[...] = scipy.fft.irfft(x, n, axis=axis)
+        return out
+    return scipy.fft.irfft(x, n, axis=axis, workers=_workers(x))
+
+
+rfftfreq = scipy.fft.rfftfreq
+
+
+def prepare(sizes: Iterable[int], dtype=np.float64):
+    """Plans the transforms of the given sizes ahead of the audio thread (e.g. after a settings change)."""
+    for n in set(sizes):
+        x = np.zeros(n, dtype=dtype)
+        spectrum = rfft(x)
+        irfft(spectrum, n)
+        # numpy.fft keeps its own plan cache for the out= path
+        irfft(rfft(x, out=spectrum), n, out=x)
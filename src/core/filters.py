@@ -0,0 +1,81 @@
+import math
+import numpy as np
+from scipy.signal import lfilter
+
+
+class IIRSection:
+    """
+    Stateful IIR filter section.
+    Processes whole blocks with a single vectorized lfilter call and carries
+    the direct-form II transposed state (zi) from one block to the next.
+    Coefficients and state are held in `dtype` (float32 or float64).
+    """
+    def __init__(self, b, a, dtype=np.float64):
+        self.b = np.asarray(b, dtype=dtype)
+        self.a = np.asarray(a, dtype=dtype)
+        self.zi = np.zeros(max(len(self.a), len(self.b)) - 1, dtype=dtype)
+
+    @classmethod
+    def dc_blocker(cls, alpha: float, dtype=np.float64) -> "IIRSection":
+        """First-order high-pass: y[n] = x[n] - x[n-1] + alpha * y[n-1]"""
+        return cls([1.0, -1.0], [1.0, -alpha], dtype)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        y, self.zi = lfilter(self.b, self.a, x, zi=self.zi)
+        return y
+
+    def reset(self):
+        self.zi[:] = 0.0
+
+
+class DelayLine:
+    """
+    Circular delay line with a write pointer and linearly interpolated
+    fractional read-out. The buffer length is rounded up to a power of two
+    so wrap-around is a bit mask instead of a modulo, and every sample is
+    mirrored into a second copy so contiguous reads never have to wrap.
+    """
+    def __init__(self, size: int):
+        n = 1 << int(np.ceil(np.log2(max(2, size))))
+        self.size = n
+        self.buffer = np.zeros(2 * n)
+        self.mask = n - 1
+        self.write_pos = 0
+
+    def read(self, delay, count: int) -> np.ndarray:
+        """
+        Reads the values that were written `delay` samples before each of the
+        next `count` write positions. `delay` may be a scalar or a per-sample
+        array and must be larger than `count` so every tap is already written.
+        """
+        if isinstance(delay, (int, float)):
+            pos = self.write_pos - delay
+            i0 = math.floor(pos)
+            frac = pos - i0
+            start = i0 & self.mask
+            seg = self.buffer[start:start + count + 1]
+            return seg[:-1] + frac * (seg[1:] - seg[:-1])
+        
+        pos = (self.write_pos + np.arange(count)) - np.asarray(delay, dtype=float)
+        i0 = np.floor(pos)
+        frac = pos - i0
+        i0 = i0.astype(np.int64) & self.mask
+        a = self.buffer[i0]
+        b = self.buffer[i0 + 1]
+        return a + frac * (b - a)
+
+    def write(self, values: np.ndarray):
+        n = len(values)
+        start = self.write_pos
+        if start + n <= self.size:
+            self.buffer[start:start + n] = values
+            self.buffer[start + self.size:start + self.size + n] = values
+        else:
+            idx = (start + np.arange(n)) & self.mask
+            self.buffer[idx] = values
+            self.buffer[idx + self.size] = values
+        self.write_pos = (start + n) & self.mask
+
+    def reset(self):
+        self.buffer[:] = 0.0
+        self.write_pos = 0
@@ -0,0 +1,110 @@
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+class FrictionModel(ABC):
+    """
+    Bow friction as a function of the relative bow/string velocity.
+    The curve is tabulated once over [-v_max, v_max] (v_max scales with v_c)
+    and evaluated by linear interpolation, so a chunk costs one np.interp
+    call; velocities outside the table take the edge values. The table is
+    rebuilt only when v_c or mu_d change.
+    """
+    name = ""
+
+    def __init__(self, v_c: float = 0.1, mu_d: float = 0.01, table_size: int = 4097, range_factor: float = 20.0):
+        self.table_size = table_size
+        self.range_factor = range_factor
+        self.v_c = None
+        self.mu_d = None
+        self.set_params(v_c, mu_d)
+
+    @abstractmethod
+    def curve(self, v_rel: np.ndarray) -> np.ndarray:
+        pass
+
+    def set_params(self, v_c: float, mu_d: float):
+        if v_c == self.v_c and mu_d == self.mu_d:
+            return
+        self.v_c = v_c
+        self.mu_d = mu_d
+        v_max = self.range_factor * v_c
+        self.grid = np.linspace(-v_max, v_max, self.table_size)
+        self.table = self.curve(self.grid)
+
+    def __call__(self, v_rel: np.ndarray) -> np.ndarray:
+        return np.interp(v_rel, self.grid, self.table)
+
+    def update(self, v_rel: np.ndarray, friction: np.ndarray):
+        """Called after every chunk with the velocities and friction used; stateful models override this."""
+        pass
+
+    def reset(self):
+        pass
+
+
+class ExponentialFriction(FrictionModel):
+    """v * exp(-(v / v_c)^2) + mu_d: sticks around v = 0, falls off quickly when slipping."""
+    name = "exponential"
+
+    def curve(self, v_rel):
+        return v_rel * np.exp(-(v_rel / self.v_c)**2) + self.mu_d
+
+
+class HyperbolicFriction(FrictionModel):
+    """v / (1 + |v| / v_c)^2 + mu_d: same stick slope, but the slip force decays only as 1/v."""
+    name = "hyperbolic"
+
+    def curve(self, v_rel):
+        return v_rel / (1.0 + np.abs(v_rel) / self.v_c)**2 + self.mu_d
+
+
+class PlasticFriction(FrictionModel):
+    """
+    Thermal (plastic rosin) friction: the rosin softens as the contact heats
+    up, which scales the exponential curve down by 1 / (1 + T). The contact
+    temperature T rises with the friction power and relaxes between chunks,
+    so the force depends on the recent history and not only on the velocity.
+    Tables are kept for `n_temps` temperatures up to `max_temp`; a chunk
+    blends the two rows around the current temperature.
+    """
+    name = "plastic"
+
+    def __init__(self, v_c: float = 0.1, mu_d: float = 0.01, heating: float = 500.0, cooling: float = 0.98,
+                 max_temp: float = 4.0, n_temps: int = 17, **kwargs):
+        self.heating = heating
+        self.cooling = cooling
+        self.temps = np.linspace(0.0, max_temp, n_temps)
+        self.temperature = 0.0
+        super().__init__(v_c, mu_d, **kwargs)
+
+    def curve(self, v_rel):
+        return v_rel * np.exp(-(v_rel / self.v_c)**2) + self.mu_d
+
+    def set_params(self, v_c: float, mu_d: float):
+        if v_c == self.v_c and mu_d == self.mu_d:
+            return
+        super().set_params(v_c, mu_d)
+        self.tables = self.table[None, :] / (1.0 + self.temps[:, None])
+
+    def __call__(self, v_rel):
+        pos = min(self.temperature / self.temps[-1], 1.0) * (len(self.temps) - 1)
+        i = min(int(pos), len(self.temps) - 2)
+        frac = pos - i
+        lo = np.interp(v_rel, self.grid, self.tables[i])
+        hi = np.interp(v_rel, self.grid, self.tables[i + 1])
+        return lo + frac * (hi - lo)
+
+    def update(self, v_rel, friction):
+        power = np.mean(np.abs(friction * v_rel))
+        self.temperature = self.cooling * self.temperature + self.heating * power * (1.0 - self.cooling)
+
+    def reset(self):
+        self.temperature = 0.0
+
+
+FRICTION_MODELS = {
+    "exponential": ExponentialFriction,
+    "hyperbolic": HyperbolicFriction,
+    "plastic": PlasticFriction,
+}
@@ -0,0 +1,104 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+from scipy.io import wavfile
+
+from .resonators import ModalResonatorBank
+
+# Impulse responses kept by modal_impulse_response, most recently used last
+CACHE_SIZE = 8
+_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+
+def modes_key(modes: List[Dict[str, float]], *settings) -> str:
+    """Hash of the (freq, amp, damping) table plus any extra settings, for caching."""
+    table = np.array([(m['freq'], m['amp'], m['damping']) for m in modes], dtype=np.float64)
+    digest = hashlib.sha1(table.tobytes())
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
+
+def decay_time(modes: List[Dict[str, float]], level_db: float = 60.0) -> float:
+    """Seconds until the slowest mode has decayed by `level_db` (T60 by default)."""
+    if not modes:
+        return 0.0
+    bw = np.array([m['damping'] * m['freq'] for m in modes])
+    # Envelope exp(-pi * bw * t)
+    return float(np.max(level_db / 20.0 * np.log(10.0) / (np.pi * bw)))
+
+
+def modal_impulse_response(modes: List[Dict[str, float]], sample_rate: int, duration: float = None,
+                           radiation_cutoff: float = 400.0, chunk: int = 4096, max_duration: float = 10.0,
+                           budget: int = 1 << 19) -> np.ndarray:
+    """
+    Body impulse response in closed form: h[n] = Re(sum_m g_m p_m^n), the
+    impulse response of the ModalResonatorBank design (same poles, gains and
+    radiation high-pass), i.e. one exponentially damped cosine per mode.
+
+    The response is evaluated in chunks of up to `chunk` samples: the
+    phasors p^k for one chunk are computed once, and chunk c is those
+    phasors times the gains advanced by p^(c * chunk). Batches of chunks
+    run as one matrix product. Chunk length and batch size shrink with the
+    mode count so every work array holds about `budget` complex values,
+    whatever the number of modes or the length. duration=None runs to the
+    T60 of the slowest mode (at most `max_duration` seconds).
+
+    Results are cached on a hash of the mode list and the settings; the
+    returned array is shared and read-only.
+    """
+    if duration is None:
+        duration = min(decay_time(modes), max_duration)
+    key = modes_key(modes, sample_rate, duration, radiation_cutoff)
+    ir = _cache.get(key)
+    if ir is not None:
+        _cache.move_to_end(key)
+        return ir
+
+    total = int(round(duration * sample_rate))
+    log_poles, gains = ModalResonatorBank.poles_and_gains(modes, sample_rate, radiation_cutoff)
+
+    ir = np.zeros(total)
+    if len(log_poles) and total:
+        chunk = max(64, min(chunk, total, budget // len(log_poles)))
+        # Chunks per product; weights are modes x batch and the product chunk x batch
+        batch = max(1, min(budget // len(log_poles), budget // chunk))
+        phasors = np.exp(np.outer(np.arange(chunk), log_poles))              # p^k, k < chunk
+        starts = np.arange(0, total, chunk)
+        for i in range(0, len(starts), batch):
+            batch_starts = starts[i:i + batch]
+            # g * p^start per chunk, computed directly so long responses do not drift
+            weights = gains[:, None] * np.exp(np.outer(log_poles, batch_starts))   # modes x chunks
+            # Column c of the product is chunk c
+            block = (phasors @ weights).real.T.ravel()
+            start = batch_starts[0]
+            n = min(len(block), total - start)
+            ir[start:start + n] = block[:n]
+
+    ir.setflags(write=False)
+    _cache[key] = ir
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return ir
+
+
+def export_impulse_response(impulse_response: np.ndarray, path: str, sample_rate: int, normalize: bool = False):
+    """
+    Writes an impulse response to .npy (float64, as is) or .wav (32-bit
+    float, which DAWs and convolution plugins read without quantization).
+    normalize=True scales the peak to 1.
+    """
+    ir = np.asarray(impulse_response, dtype=np.float64)
+    if normalize:
+        peak = np.max(np.abs(ir))
+        if peak > 0:
+            ir = ir / peak
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        np.save(path, ir)
+    elif ext == ".wav":
+        wavfile.write(path, int(sample_rate), ir.astype(np.float32))
+    else:
+        raise ValueError(f"Unsupported impulse response format: {ext} (use .wav or .npy)")
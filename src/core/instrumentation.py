@@ -0,0 +1,147 @@
+import math
+import time
+from collections import deque
+from typing import Dict
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram with log-spaced bins (default 1 us .. 1 s).
+    Written by a single thread (the audio callback) without locks or
+    allocation; readers take approximate percentiles from a copy of the
+    counts, which is safe under the GIL.
+    """
+    def __init__(self, min_value=1.0, max_value=1e6, n_bins=60):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.n_bins = n_bins
+        self._log_min = math.log(min_value)
+        self._inv_step = n_bins / (math.log(max_value) - self._log_min)
+        # bins 0 and n_bins + 1 collect under/overflow
+        self.counts = [0] * (n_bins + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        if value < self.min_value:
+            idx = 0
+        elif value >= self.max_value:
+            idx = self.n_bins + 1
+        else:
+            idx = 1 + int((math.log(value) - self._log_min) * self._inv_step)
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def _bin_upper(self, idx: int) -> float:
+        if idx == 0:
+            return self.min_value
+        if idx > self.n_bins:
+            return self.max
+        return math.exp(self._log_min + idx / self._inv_step)
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bin holding the q-th percentile (0..100)."""
+        counts = list(self.counts)
+        n = sum(counts)
+        if n == 0:
+            return 0.0
+        target = q / 100.0 * n
+        seen = 0
+        for idx, c in enumerate(counts):
+            seen += c
+            if seen >= target and c:
+                return min(self._bin_upper(idx), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        n = self.count
+        return {
+            "count": n,
+            "mean": self.total / n if n else 0.0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def reset(self):
+        self.counts = [0] * (self.n_bins + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class CallbackStats:
+    """
+    Real-time observability for the audio callback: per-stage durations (us),
+    the fraction of the block deadline used, deadline misses, and the xrun
+    flags reported by the audio backend with a short log of recent events.
+    Adaptive excitation quality changes are logged the same way.
+    """
+    STAGES = ("params", "excitation", "sympathetic", "fft", "body", "room", "hpf", "normalize", "limiter")
+    XRUN_FLAGS = ("output_underflow", "output_overflow", "priming_output")
+
+    def __init__(self, log_size=64):
+        self.stages = {name: LatencyHistogram() for name in self.STAGES}
+        self.total = LatencyHistogram()
+        # Deadline load in percent of the block period
+        self.load = LatencyHistogram(min_value=0.1, max_value=1000.0, n_bins=60)
+        self.callbacks = 0
+        self.deadline_misses = 0
+        self.xruns = {flag: 0 for flag in self.XRUN_FLAGS}
+        self.xrun_log = deque(maxlen=log_size)
+        self.quality_changes = 0
+        self.quality_log = deque(maxlen=log_size)
+
+    def record_stage(self, name: str, ns: int):
+        self.stages[name].record(ns * 1e-3)
+
+    def record_callback(self, ns: int, frames: int, sample_rate: float):
+        us = ns * 1e-3
+        self.total.record(us)
+        load = us / (frames / sample_rate * 1e6) * 100.0
+        self.load.record(load)
+        self.callbacks += 1
+        if load > 100.0:
+            self.deadline_misses += 1
+
+    def record_status(self, status, sample_count: int):
+        if not status:
+            return
+        flags = [flag for flag in self.XRUN_FLAGS if getattr(status, flag, False)]
+        for flag in flags:
+            self.xruns[flag] += 1
+        if flags:
+            self.xrun_log.append((time.monotonic(), sample_count, tuple(flags)))
+
+    def record_quality(self, sample_count: int, source: str, old_level: int, new_level: int, load_percent: float):
+        self.quality_changes += 1
+        self.quality_log.append((time.monotonic(), sample_count, source, old_level, new_level, load_percent))
+
+    def snapshot(self) -> Dict:
+        return {
+            "callbacks": self.callbacks,
+            "deadline_misses": self.deadline_misses,
+            "total_us": self.total.summary(),
+            "load_percent": self.load.summary(),
+            "stages_us": {name: h.summary() for name, h in self.stages.items()},
+            "xruns": dict(self.xruns),
+            "xrun_log": list(self.xrun_log),
+            "quality_changes": self.quality_changes,
+            "quality_log": list(self.quality_log),
+        }
+
+    def reset(self):
+        for h in self.stages.values():
+            h.reset()
+        self.total.reset()
+        self.load.reset()
+        self.callbacks = 0
+        self.deadline_misses = 0
+        self.xruns = {flag: 0 for flag in self.XRUN_FLAGS}
+        self.xrun_log.clear()
+        self.quality_changes = 0
+        self.quality_log.clear()
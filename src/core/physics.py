@@ -2,6 +2,7 @@ import numpy as np
 import os
 from typing import List, Dict
 from .geometry import Point, GeometryExtractor
+from .impulse import modal_impulse_response
 from scipy.signal import savgol_filter
 
 class AcousticModel:
@@ -34,6 +35,14 @@ class AcousticModel:
         self.sampled_freqs = None
         self.smoothing_level = 0.0
         self._load_sampled_spl()
+        
+        # --- SPECTRUM EVALUATION CACHES ---
+        # Frequency grids and their mode-independent terms, keyed by (f_min, f_max, n_points)
+        self._spectrum_grids = {}
+        # Mode table (freq, amp, damping) rows, refilled in place while the mode count is unchanged
+        self._mode_table = np.zeros((3, 0))
+        # Complex values per (modes x frequencies) work array
+        self.spectrum_chunk_budget = 1 << 16
 
     def _load_sampled_spl(self):
         try:
@@ -163,11 +172,73 @@ class AcousticModel:
 
         return modes
 
+    def impulse_response(self, modes: List[Dict[str, float]] = None, sample_rate: int = 44100,
+                         duration: float = None) -> np.ndarray:
+        """Body impulse response of the predicted (or given) modes; see modal_impulse_response."""
+        if modes is None: modes = self.predict()
+        return modal_impulse_response(modes, sample_rate, duration)
+
+    def _spectrum_grid(self, f_min, f_max, n_points):
+        """Frequency grid with its squares, LF floor and radiation high-pass, built once per grid."""
+        key = (f_min, f_max, n_points)
+        grid = self._spectrum_grids.get(key)
+        if grid is None:
+            freqs = np.linspace(f_min, f_max, n_points)
+            # Physical Baseline: Low-Frequency high-pass roll-off for radiation
+            # Instead of 0.05 flat, we use a 2nd order HPF floor characteristic
+            f_hpf = 200.0
+            floor_mag = 0.05 * (freqs / f_hpf)**2 / (1 + (freqs / f_hpf)**2 + 1e-6)
+            # Global Radiation High-Pass (Violin acts as a dipole/monopole with LF roll-off)
+            # Targeted to hit approx -20dB at 100Hz
+            f_rad = 400.0
+            hp_roll = (freqs / f_rad)**3 / (1 + (freqs / f_rad)**3)
+            grid = (freqs, freqs**2, floor_mag, hp_roll)
+            for array in grid:
+                array.setflags(write=False)
+            self._spectrum_grids[key] = grid
+        return grid
+
+    def _fill_mode_table(self, modes):
+        """Rows f0, amp * f0^2 (numerator), gamma = damping * f0 of the mode table."""
+        if self._mode_table.shape[1] != len(modes):
+            self._mode_table = np.zeros((3, len(modes)))
+        table = self._mode_table
+        for i, key in enumerate(('freq', 'amp', 'damping')):
+            table[i] = [m[key] for m in modes]
+        f0, amp, damping = table
+        amp *= f0**2
+        damping *= f0
+        return table
+
+    def _modal_response(self, table, freqs, freqs_sq, response):
+        """
+        Adds sum_m amp f0^2 / ((f0^2 - f^2) + j gamma f) to `response` as one
+        broadcast over a (modes x frequencies) grid, in frequency chunks of at
+        most spectrum_chunk_budget grid points. With a = f0^2 - f^2 and
+        d = a^2 + gamma^2 f^2, each term is num (a - j gamma f) / d, so a chunk
+        is one real grid of 1 / d and two matrix-vector products.
+        """
+        f0, numerator, gamma = table
+        f0_sq = f0**2
+        gamma_sq = gamma**2
+        numerator_gamma = numerator * gamma
+        chunk = max(1, self.spectrum_chunk_budget // max(1, len(f0)))
+        for start in range(0, len(freqs), chunk):
+            f_sq = freqs_sq[start:start + chunk]
+            a = np.subtract.outer(f0_sq, f_sq)
+            inv_d = a * a
+            inv_d += np.multiply.outer(gamma_sq, f_sq)
+            np.reciprocal(inv_d, out=inv_d)
+            a *= inv_d
+            response.real[start:start + chunk] += numerator @ a
+            response.imag[start:start + chunk] -= (numerator_gamma @ inv_d) * freqs[start:start + chunk]
+        return response
+
     def calculate_spectrum(self, modes, f_min=100, f_max=10000, n_points=1200, mode="MODEL", noise_level=0.0):
         """
         Calculates the frequency response spectrum (SPL) from the given modes with physical radiation characteristics.
         """
-        freqs = np.linspace(f_min, f_max, n_points)
+        freqs, freqs_sq, floor_mag, hp_roll = self._spectrum_grid(f_min, f_max, n_points)
         
         if mode == "FLAT":
             # Flat line with slight realistic HF roll-off
@@ -178,29 +249,11 @@ class AcousticModel:
             spl_db = self.get_sampled_response(freqs)
             return freqs, spl_db
 
-        response = np.zeros_like(freqs, dtype=complex)
-        
-        # Physical Baseline: Low-Frequency high-pass roll-off for radiation
-        # Instead of 0.05 flat, we use a 2nd order HPF floor characteristic
-        f_hpf = 200.0
-        floor_mag = 0.05 * (freqs / f_hpf)**2 / (1 + (freqs / f_hpf)**2 + 1e-6)
-        response += floor_mag
-        
-        for mode_data in modes:
-            f0 = mode_data['freq']
-            amp = mode_data['amp']
-            gamma = mode_data['damping'] * f0 
-            
-            numerator = amp * f0**2
-            denominator = (f0**2 - freqs**2) + 1j * gamma * freqs
-            response += numerator / denominator
+        response = floor_mag.astype(complex)
+        if modes:
+            self._modal_response(self._fill_mode_table(modes), freqs, freqs_sq, response)
             
         magnitude = np.abs(response)
-        
-        # Global Radiation High-Pass (Violin acts as a dipole/monopole with LF roll-off)
-        # Targeted to hit approx -20dB at 100Hz
-        f_rad = 400.0
-        hp_roll = (freqs / f_rad)**3 / (1 + (freqs / f_rad)**3)
         magnitude *= hp_roll
         
         magnitude = np.maximum(magnitude, 1e-9)
@@ -0,0 +1,195 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Dict
+
+
+@dataclass(frozen=True)
+class ModalBankOperators:
+    """
+    Block operators of a resonator bank for a fixed mode set and block size
+    (see ModalResonatorBank). Complex operators are stored as real arrays
+    with interleaved (re, im) columns or rows, so every product is one real
+    matmul and complex results are views of real ones.
+    """
+    frames: int
+    sub_block: int            # b; the block is padded to n_sub * b samples
+    state_update: np.ndarray  # (b, 2 * modes): p^(b-1-j), interleaved columns
+    sub_start: np.ndarray     # (n_sub + 1, modes): p^(b*c), decay of the block's initial state
+    carry: np.ndarray         # (n_sub + 1, n_sub, modes): p^(b*(c-1-d)) for d < c, else 0
+    zero_state: np.ndarray    # (b, b) real Toeplitz matrix of the bank impulse response (transposed)
+    zero_input: np.ndarray    # (2 * modes, b): rows re(g * p^(k+1)), -im(g * p^(k+1)) interleaved
+
+    @property
+    def n_modes(self) -> int:
+        return self.sub_start.shape[1]
+
+
+class ModalResonatorBank:
+    """
+    Body response as a bank of two-pole resonators, one per mode.
+    Each resonator is the real part of a complex one-pole z[n] = p z[n-1] + x[n]
+    with p = r * exp(j * theta), r = exp(-pi * bandwidth / fs). Because the
+    bank is linear, a block is split into sub-blocks of `sub_block` samples
+    and computed as a few matrix products with no per-sample Python loop:
+    the zero-state response within each sub-block (one Toeplitz product),
+    the state each sub-block ends with, the states at the sub-block starts
+    (initial state decay plus the carry from earlier sub-blocks; one more
+    "start" past the block is the carried state, with the padding undone),
+    and the decay of those states through each sub-block. The operators
+    hold sub_block x modes values instead of frames x modes, so they stay
+    in cache for any block size. Cost is O(frames * modes) in a fixed
+    handful of NumPy calls per block.
+    """
+    SUB_BLOCK = 128
+
+    def __init__(self):
+        self.state = np.zeros(0, dtype=complex)
+
+    @staticmethod
+    def poles_and_gains(modes: List[Dict[str, float]], sample_rate: float, radiation_cutoff: float = 400.0):
+        """
+        Log poles ln(p) and gains g of the resonators (modes below Nyquist
+        only), shared by design() and impulse.modal_impulse_response.
+        """
+        nyquist = sample_rate / 2.0
+        fc = np.array([m['freq'] for m in modes if m['freq'] < nyquist], dtype=float)
+        amp = np.array([m['amp'] for m in modes if m['freq'] < nyquist], dtype=float)
+        damp = np.array([m['damping'] for m in modes if m['freq'] < nyquist], dtype=float)
+
+        bw = damp * fc
+        r = np.exp(-np.pi * bw / sample_rate)
+        log_poles = -np.pi * bw / sample_rate + 2j * np.pi * fc / sample_rate
+
+        # Peak gain of Re(g / (1 - p z^-1)) at fc is about g / (2 (1 - r)),
+        # so this matches the Lorentzian 'amp' of the FFT path. The global
+        # radiation high-pass is applied per mode at its centre frequency.
+        if radiation_cutoff:
+            hp_roll = (fc / radiation_cutoff)**3 / (1 + (fc / radiation_cutoff)**3)
+        else:
+            hp_roll = np.ones_like(fc)
+        gains = 2.0 * (1.0 - r) * amp * hp_roll
+        return log_poles, gains
+
+    @staticmethod
+    def design(modes: List[Dict[str, float]], frames: int, sample_rate: float, dtype=np.float64,
+               radiation_cutoff: float = 400.0, sub_block: int = SUB_BLOCK) -> ModalBankOperators:
+        """
+        Operators for `frames`-sample blocks, designed in float64 and stored in
+        `dtype` precision. radiation_cutoff=None leaves out the body radiation high-pass.
+        """
+        log_poles, gains = ModalResonatorBank.poles_and_gains(modes, sample_rate, radiation_cutoff)
+
+        b = min(sub_block, frames)
+        n_sub = -(-frames // b)
+        pad = n_sub * b - frames
+        k = np.arange(b)
+        c = np.arange(n_sub + 1)
+        zero_input = np.exp(np.outer(k + 1, log_poles)) * gains[None, :]   # g * p^(k+1)
+        state_update = np.exp(np.outer(b - 1 - k, log_poles))               # p^(b-1-j)
+        sub_start = np.exp(np.outer(b * c, log_poles))                      # p^(b*c)
+        lag = c[:, None] - 1 - np.arange(n_sub)[None, :]
+        carry = np.where(lag[:, :, None] >= 0, np.exp(b * np.maximum(lag, 0)[:, :, None] * log_poles), 0.0)
+        # The padding only decays the carried state; undo that in its row
+        sub_start[-1] *= np.exp(-pad * log_poles)
+        carry[-1] *= np.exp(-pad * log_poles)
+
+        impulse = np.empty(b)
+        impulse[0] = np.sum(gains).real
+        impulse[1:] = zero_input[:-1].sum(axis=1).real
+        lag = k[:, None] - k[None, :]
+        zero_state = np.where(lag >= 0, impulse[np.maximum(lag, 0)], 0.0)
+
+        complex_dtype = np.result_type(dtype, np.complex64)
+        # Long decays underflow in single precision; flush them to zero
+        # rather than leave subnormals that make every product crawl
+        tiny = np.finfo(dtype).tiny
+        for op in (zero_input, state_update, sub_start, carry):
+            op[np.abs(op) < tiny] = 0.0
+        # Re(starts @ zero_input.T) as one real product with the interleaved starts
+        zero_input = np.stack((zero_input.real.T, -zero_input.imag.T), axis=1).reshape(-1, b)
+        return ModalBankOperators(frames, b, state_update.astype(complex_dtype).view(np.dtype(dtype)),
+                                  sub_start.astype(complex_dtype), carry.astype(complex_dtype),
+                                  np.ascontiguousarray(zero_state.T, dtype=dtype), zero_input.astype(dtype))
+
+    def process(self, x: np.ndarray, ops: ModalBankOperators) -> np.ndarray:
+        if len(self.state) != ops.n_modes or self.state.dtype != ops.sub_start.dtype:
+            # Mode count changed: keep the states of the modes that remain
+            state = np.zeros(ops.n_modes, dtype=ops.sub_start.dtype)
+            n = min(len(state), len(self.state))
+            state[:n] = self.state[:n]
+            self.state = state
+
+        frames = ops.frames
+        b = ops.sub_block
+        n_sub = ops.carry.shape[1]
+        if n_sub * b != frames:
+            x = np.concatenate((x, np.zeros(n_sub * b - frames, dtype=x.dtype)))
+        # Row c is sub-block c
+        blocks = x.reshape(n_sub, b)
+        ends = (blocks @ ops.state_update).view(ops.sub_start.dtype)         # state added by each sub-block
+        starts = (ops.carry * ends).sum(axis=1)
+        starts += self.state * ops.sub_start
+        y = blocks @ ops.zero_state
+        y += starts[:-1].view(ops.zero_input.dtype) @ ops.zero_input
+
+        self.state = starts[-1]
+        return y.ravel()[:frames]
+
+    def reset(self):
+        self.state[:] = 0.0
+
+
+class SympatheticStrings:
+    """
+    The undriven strings ringing along through the bridge. Each string is a
+    harmonic series of lightly damped modes (with a little stiffness
+    inharmonicity, higher partials decaying faster), and all strings run as
+    one ModalResonatorBank, so the whole set costs one vectorized pass per block.
+    Partials stop at `max_freq`: above 3 kHz they are weak (1/k) and die
+    within a few hundred ms.
+    The operators for the configured block size come from prepare(), off
+    the audio thread; a block of another size (e.g. an offline render)
+    gets its own design, which does not replace them.
+    """
+    TUNING = (196.0, 293.66, 440.0, 659.25)  # G3 D4 A4 E5
+
+    def __init__(self, tuning=TUNING, max_freq: float = 3000.0, t60: float = 1.5, inharmonicity: float = 1e-4):
+        self.modes = []
+        for f0 in tuning:
+            for k in range(1, int(max_freq / f0) + 1):
+                freq = k * f0 * np.sqrt(1.0 + inharmonicity * k**2)
+                # Bandwidth for the partial's T60: bw = ln(1000) / (pi * T60)
+                bw = np.log(1000.0) / (np.pi * t60 / np.sqrt(k))
+                self.modes.append({'freq': freq, 'amp': 1.0 / k, 'damping': bw / freq})
+        self.bank = ModalResonatorBank()
+        # Design for the configured block size, keyed by (frames, sample_rate, dtype)
+        self.ops = None
+        self.key = None
+        # Design for the last other block size process() was given
+        self.other_ops = None
+        self.other_key = None
+
+    def _design(self, key):
+        frames, sample_rate, dtype = key
+        return ModalResonatorBank.design(self.modes, frames, sample_rate, dtype, radiation_cutoff=None)
+
+    def prepare(self, frames: int, sample_rate: float, dtype=np.float64):
+        """Designs the block operators for the configured block size ahead of time."""
+        key = (frames, sample_rate, np.dtype(dtype))
+        if key != self.key:
+            self.ops = self._design(key)
+            self.key = key
+
+    def process(self, x: np.ndarray, sample_rate: float) -> np.ndarray:
+        key = (len(x), sample_rate, x.dtype)
+        if key == self.key:
+            ops = self.ops
+        else:
+            if key != self.other_key:
+                self.other_ops = self._design(key)
+                self.other_key = key
+            ops = self.other_ops
+        return self.bank.process(x, ops)
+
+    def reset(self):
+        self.bank.reset()
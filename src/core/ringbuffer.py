@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Single-producer / single-consumer ring of audio samples.
+    The producer (audio thread) never blocks or allocates: it copies into
+    the preallocated ring and overwrites the oldest samples when the
+    consumer falls behind. The consumer reads everything written since its
+    last read in one call and is told how many samples it lost.
+
+    Positions are absolute sample counts. The producer announces the range
+    it is about to overwrite (`reserved`) before copying and publishes it
+    (`committed`) afterwards, so the consumer can discard anything that was
+    overwritten while it was copying.
+    """
+    def __init__(self, capacity: int, dtype=np.float64):
+        n = 1 << int(np.ceil(np.log2(max(2, capacity))))
+        self.capacity = n
+        self.mask = n - 1
+        self.buffer = np.zeros(n, dtype=dtype)
+        self.reserved = 0    # producer: end of the range being written
+        self.committed = 0   # producer: end of the range fully written
+        self.read_pos = 0    # consumer: next position to read
+        self.dropped = 0     # consumer: total samples lost to overruns
+
+    def write(self, samples: np.ndarray):
+        """Producer side. Keeps only the newest `capacity` samples of an oversized block."""
+        n = len(samples)
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            self.reserved += n - self.capacity
+            self.committed = self.reserved
+            n = self.capacity
+        start = self.committed
+        self.reserved = start + n
+        i = start & self.mask
+        first = min(n, self.capacity - i)
+        self.buffer[i:i + first] = samples[:first]
+        self.buffer[:n - first] = samples[first:]
+        self.committed = start + n
+
+    def read(self):
+        """
+        Consumer side. Returns (samples, dropped) with every sample committed
+        since the last read and the number of samples lost since then.
+        """
+        end = self.committed
+        start = max(self.read_pos, self.reserved - self.capacity)
+        lost = start - self.read_pos
+
+        n = max(0, end - start)
+        out = np.empty(n, dtype=self.buffer.dtype)
+        i = start & self.mask
+        first = min(n, self.capacity - i)
+        out[:first] = self.buffer[i:i + first]
+        out[first:] = self.buffer[:n - first]
+
+        # Anything the producer reserved meanwhile may have torn the oldest samples
+        torn = min(n, max(0, self.reserved - self.capacity - start))
+        if torn:
+            out = out[torn:]
+            lost += torn
+
+        self.read_pos = end
+        self.dropped += lost
+        return out, lost
+
+    def reset(self):
+        self.read_pos = self.committed
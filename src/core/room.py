@@ -0,0 +1,197 @@
+import threading
+from typing import Tuple
+import numpy as np
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+
+from .convolution import PartitionedConvolver
+
+
+def resample(data: np.ndarray, rate: int, sample_rate: int) -> np.ndarray:
+    """Polyphase resampling from `rate` to `sample_rate` (both integer rates)."""
+    if rate == sample_rate:
+        return data
+    g = np.gcd(int(rate), int(sample_rate))
+    return resample_poly(data, int(sample_rate) // g, int(rate) // g)
+
+
+def read_impulse_response(path: str) -> Tuple[np.ndarray, int]:
+    """Reads a WAV impulse response at its own rate as (data, rate); data is mono float and peak-normalized."""
+    rate, data = wavfile.read(path)
+    if data.dtype.kind in 'iu':
+        info = np.iinfo(data.dtype)
+        data = (data.astype(np.float64) - (info.min + info.max + 1) / 2.0) / (info.max - info.min + 1) * 2.0
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    peak = np.max(np.abs(data))
+    return (data / peak if peak > 0 else data), rate
+
+
+class RoomConvolver:
+    """
+    Two-stage non-uniformly partitioned convolution for long (multi-second)
+    room impulse responses.
+
+    The head, the first H = 2 * T samples of the response, runs in the audio
+    thread on a uniformly partitioned convolver with small partitions, so it
+    adds no latency and its cost does not depend on the response length.
+    The tail (everything after H) uses partitions of T samples on a
+    background thread: every completed block of T input samples is handed
+    over, and its tail output is first needed H - T = T samples later. The
+    audio thread never waits; a tail block that is not ready in time is
+    skipped and counted in `tail_misses` (audio blocks with missing tail).
+    When the head buffers a partition (block size not a multiple of the
+    partition size), the tail output is delayed by the same `latency`.
+    A tail block is posted before it is due only for blocks of at most 2 * T
+    samples, so T defaults to the next power of two of `block_size` (at
+    least 2048 and the head partition size).
+    Offline rendering passes realtime=False to process(), which computes
+    the tail inline instead, feeding longer blocks to it in pieces of T
+    samples, so nothing is ever skipped. If the worker dies
+    (an exception in the tail convolver, kept in `error`), waiting for it
+    raises RuntimeError instead of hanging.
+    """
+    SLOTS = 4
+
+    def __init__(self, impulse_response: np.ndarray, partition_size: int = 256, tail_partition: int = None,
+                 block_size: int = None, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        T = tail_partition or max(2048, partition_size, 1 << (int(block_size or 1) - 1).bit_length())
+        self.tail_partition = T
+        self.head_length = 2 * T
+        ir = np.asarray(impulse_response, dtype=np.float64)
+        self.head = PartitionedConvolver(ir[:self.head_length], partition_size, block_size, self.dtype)
+
+        tail_ir = ir[self.head_length:]
+        self.has_tail = len(tail_ir) > 0
+        self.tail_misses = 0
+        self.position = 0           # audio thread: samples processed
+        self.tail_fill = 0
+        self.tail_in = np.zeros(T, dtype=self.dtype)
+
+        if self.has_tail:
+            self.tail = PartitionedConvolver(tail_ir, T, T, self.dtype)
+            # Job slots: input blocks posted by the audio thread, output blocks written by the worker
+            self.job_in = np.zeros((self.SLOTS, T), dtype=self.dtype)
+            self.job_out = np.zeros((self.SLOTS, T), dtype=self.dtype)
+            self.posted = -1        # audio thread: last posted block index
+            self.done = -1          # worker: last finished block index
+            self.pending = threading.Semaphore(0)
+            # Notified by the worker whenever it finishes a block (or stops)
+            self.idle = threading.Condition()
+            self.error = None       # exception that stopped the worker
+            self.running = True
+            self.worker = threading.Thread(target=self._run, daemon=True)
+            self.worker.start()
+
+    def _run(self):
+        try:
+            while True:
+                self.pending.acquire()
+                if not self.running:
+                    return
+                block = self.done + 1
+                slot = block % self.SLOTS
+                self.tail.process(self.job_in[slot], out=self.job_out[slot])
+                with self.idle:
+                    self.done = block
+                    self.idle.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.idle:
+                self.idle.notify_all()
+
+    def _wait_idle(self, poll: float = 0.1):
+        """Blocks until the worker has finished every posted block; raises RuntimeError if it has stopped."""
+        with self.idle:
+            while self.done < self.posted:
+                if not self.worker.is_alive():
+                    raise RuntimeError(f"Room tail worker stopped with {self.posted - self.done} blocks pending") from self.error
+                self.idle.wait(poll)
+
+    def _post_tail_block(self, realtime: bool):
+        block = self.posted + 1
+        slot = block % self.SLOTS
+        self.job_in[slot] = self.tail_in
+        if realtime:
+            self.posted = block
+            self.pending.release()
+        else:
+            self._wait_idle()
+            self.tail.process(self.job_in[slot], out=self.job_out[slot])
+            self.posted = block
+            self.done = block
+
+    def process(self, x: np.ndarray, out: np.ndarray = None, realtime: bool = True) -> np.ndarray:
+        out = self.head.process(x, out=out)
+        if not self.has_tail:
+            self.position += len(x)
+            return out
+
+        # Offline, blocks longer than T go to the tail in pieces of T, so
+        # every tail block is computed before it is due
+        n = len(x)
+        step = n if realtime else self.tail_partition
+        missed = False
+        for i in range(0, n, step):
+            missed |= self._tail(x[i:i + step], out[i:i + step], realtime)
+        if missed:
+            self.tail_misses += 1
+        return out
+
+    def _tail(self, x: np.ndarray, out: np.ndarray, realtime: bool) -> bool:
+        """Adds the tail output to `out` and feeds `x` to the tail; returns whether a tail block was missing."""
+        T = self.tail_partition
+        n = len(x)
+        start = self.position
+
+        # Add the tail blocks that cover this block; output block b starts at b * T + H + latency
+        delay = self.head_length + self.head.latency
+        missed = False
+        i = 0
+        while i < n:
+            s = start + i - delay
+            if s < 0:
+                i = min(n, i - s)
+                continue
+            b, offset = divmod(s, T)
+            take = min(T - offset, n - i)
+            if self.done >= b and self.done - b < self.SLOTS:
+                out[i:i + take] += self.job_out[b % self.SLOTS, offset:offset + take]
+            else:
+                missed = True
+            i += take
+
+        # Feed the input to the tail in blocks of T
+        i = 0
+        while i < n:
+            take = min(T - self.tail_fill, n - i)
+            self.tail_in[self.tail_fill:self.tail_fill + take] = x[i:i + take]
+            self.tail_fill += take
+            i += take
+            if self.tail_fill == T:
+                self._post_tail_block(realtime)
+                self.tail_fill = 0
+
+        self.position += n
+        return missed
+
+    def close(self):
+        if self.has_tail and self.running:
+            self.running = False
+            self.pending.release()
+            self.worker.join()
+
+    def reset(self):
+        """Clears the signal state; the worker must be idle (offline use or a stopped stream)."""
+        self.head.reset()
+        self.position = 0
+        self.tail_fill = 0
+        if self.has_tail:
+            self._wait_idle()
+            self.tail.reset()
+            self.job_out[:] = 0.0
+            self.posted = -1
+            self.done = -1
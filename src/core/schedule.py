@@ -0,0 +1,39 @@
+import bisect
+import numpy as np
+from typing import List, Sequence, Tuple
+
+
+class NoteSchedule:
+    """
+    Looping melody compiled to sample positions.
+    Note onsets are stored as a cumulative sample array, so finding the note
+    at any position is a bisect and a block costs the same for a melody of
+    thousands of notes as for a single one.
+    """
+    def __init__(self, notes: Sequence[Tuple[float, float]], sample_rate: float):
+        # notes: [(freq, duration_seconds), ...]
+        self.freqs = [float(f) for f, _ in notes]
+        ends = np.round(np.cumsum([d for _, d in notes]) * sample_rate).astype(np.int64)
+        self.onsets = [0] + ends[:-1].tolist()
+        self.total = int(ends[-1]) if len(ends) else 0
+        self.sample_rate = sample_rate
+
+    def segments(self, position: int, frames: int) -> List[Tuple[int, int, float]]:
+        """Splits the block starting at absolute sample `position` into (offset, length, freq) runs of one note each."""
+        if self.total <= 0:
+            return [(0, frames, self.freqs[0] if self.freqs else 0.0)]
+        runs = []
+        offset = 0
+        pos = position % self.total
+        i = bisect.bisect_right(self.onsets, pos) - 1
+        while offset < frames:
+            end = self.onsets[i + 1] if i + 1 < len(self.onsets) else self.total
+            n = min(frames - offset, end - pos)
+            if n > 0:
+                runs.append((offset, n, self.freqs[i]))
+            offset += n
+            pos += n
+            i += 1
+            if i == len(self.onsets):
+                i, pos = 0, 0
+        return runs
@@ -1,163 +1,650 @@
 import numpy as np
-import sounddevice as sd
-import queue
 import os
-from typing import List, Dict
+from typing import List, Dict, Tuple, Any, Optional
+from dataclasses import dataclass, field, replace
+from collections import OrderedDict
 import threading
+import time
 from scipy.signal import savgol_filter
 from abc import ABC, abstractmethod
+from . import fft
+from .filters import IIRSection, DelayLine
+from .convolution import PartitionedConvolver, response_to_impulse
+from .resonators import ModalResonatorBank, SympatheticStrings
+from .wavio import WavWriter
+from .ringbuffer import AudioRingBuffer
+from .capture import AudioCapture
+from .instrumentation import CallbackStats
+from .backends import AudioBackend, SoundDeviceBackend
+from .wavetable import sawtooth_wavetable
+from .schedule import NoteSchedule
+from .friction import FrictionModel, ExponentialFriction, FRICTION_MODELS
+from .voices import Voice, VoicePool
+from .room import RoomConvolver, read_impulse_response, resample
 
 class ExcitationSource(ABC):
+    # Relative cost of each quality level, full quality first
+    quality_costs = (1.0,)
+
+    def __init__(self):
+        self.quality = 0
+        # Measured seconds per sample at each quality level (EMA)
+        self.measured_costs = {}
+
+    @property
+    def quality_levels(self) -> int:
+        return len(self.quality_costs)
+
+    def set_quality(self, level: int):
+        """0 is the full model; higher levels trade accuracy for speed."""
+        self.quality = max(0, min(level, self.quality_levels - 1))
+
+    def record_cost(self, frames: int, seconds: float):
+        rate = seconds / frames
+        old = self.measured_costs.get(self.quality)
+        if old is None:
+            self.measured_costs[self.quality] = rate
+        else:
+            # One-off spikes are clipped so they do not trigger a step down alone
+            self.measured_costs[self.quality] = 0.9 * old + 0.1 * min(rate, 4.0 * old)
+
+    def ready(self, level: int) -> bool:
+        """Whether `level` can play the current note without building anything on the audio thread."""
+        return True
+
+    def cost_per_sample(self, level: int = None) -> float:
+        """
+        Estimated seconds per sample at `level` (the current one by default),
+        scaled by quality_costs from the nearest measured level.
+        """
+        level = self.quality if level is None else level
+        if level in self.measured_costs:
+            return self.measured_costs[level]
+        if not self.measured_costs:
+            return 0.0
+        ref = min(self.measured_costs, key=lambda l: abs(l - level))
+        return self.measured_costs[ref] * self.quality_costs[level] / self.quality_costs[ref]
+
     @abstractmethod
-    def generate(self, frames: int, frequency: float, sample_rate: float, bow_velocity: float, bow_force: float) -> np.ndarray:
+    def generate(self, frames: int, frequency, sample_rate: float, bow_velocity: float, bow_force: float,
+                 note: float = None) -> np.ndarray:
+        """
+        `frequency` is a scalar for a fixed pitch or a per-sample array of
+        `frames` values; `note` is the played note such a trajectory moves
+        around (vibrato) or towards (glide), None if there is none.
+        """
+        pass
+
+    def reset(self):
+        """Returns the source to its initial (silent) state."""
         pass
 
 class SawtoothSource(ExcitationSource):
+    """
+    Band-limited sawtooth read from per-octave mip-mapped wavetables,
+    one interpolated table lookup per block. The tables hold no DC, so no
+    DC blocker is needed.
+    """
     def __init__(self):
+        super().__init__()
         self.phase = 0.0
-        # DC blocker state
-        self.dc_x_prev = 0.0
-        self.dc_y_prev = 0.0
+        self.wavetable = None
+
+    def generate(self, frames: int, frequency, sample_rate: float, bow_velocity: float, bow_force: float,
+                 note: float = None) -> np.ndarray:
+        if self.wavetable is None or self.wavetable.sample_rate != sample_rate:
+            self.wavetable = sawtooth_wavetable(sample_rate)
 
-    def generate(self, frames: int, frequency: float, sample_rate: float, bow_velocity: float, bow_force: float) -> np.ndarray:
-        t = np.arange(frames) / sample_rate
         phase_increments = frequency / sample_rate
-        current_phases = self.phase + np.cumsum(np.ones(frames) * phase_increments) - phase_increments
+        if np.ndim(frequency):
+            # Cumulative phase of the frequency trajectory; the octave table
+            # is picked for the highest pitch so nothing in the block aliases
+            current_phases = self.phase + np.cumsum(phase_increments) - phase_increments
+            f_table = np.max(frequency)
+        else:
+            current_phases = self.phase + np.arange(frames) * phase_increments
+            f_table = frequency
         current_phases -= np.floor(current_phases)
         
-        self.phase = (current_phases[-1] + phase_increments) % 1.0
+        self.phase = (current_phases[-1] + np.take(phase_increments, -1)) % 1.0
         
-        raw_saw = 2.0 * (current_phases - 0.5)
-        # Match legacy boxcar filter
-        source = np.convolve(raw_saw, np.ones(4)/4, mode='same')
-        
-        # DC Blocking Filter (High-pass IIR)
-        # y[n] = x[n] - x[n-1] + 0.995 * y[n-1]
-        output = np.zeros(frames)
-        for i in range(frames):
-            output[i] = source[i] - self.dc_x_prev + 0.995 * self.dc_y_prev
-            self.dc_x_prev = source[i]
-            self.dc_y_prev = output[i]
+        output = self.wavetable.lookup(current_phases, f_table)
         
         # Use bow_velocity as gain for sawtooth baseline
         return output * bow_velocity
 
+    def reset(self):
+        self.phase = 0.0
+
 class WaveguideSource(ExcitationSource):
+    """
+    Bowed string as two circular delay lines meeting at the bow point.
+    Each line holds the wave leaving the bow towards one end (nut or bridge)
+    and is read back one inverted round trip later with fractional delay,
+    so tuning follows sample_rate / (2 * frequency) exactly.
+    Since no wave can return to the bow sooner than the shorter round trip,
+    the bow interaction is evaluated vectorized over chunks of that length.
+    A frequency trajectory becomes delay lengths that are updated every
+    chunk (at most half a period), and per sample for the output read,
+    which follows each chunk so the lines never need more history than
+    two round trips, whatever the block size.
+    Lower quality levels move the bow towards the middle of the string:
+    the shorter (nut side) waveguide grows, so chunks get longer and fewer.
+    """
+    bow_positions = (0.25, 1.0 / 3.0, 0.5)
+    quality_costs = (1.0, 0.75, 0.5)
+
     def __init__(self, size=2048):
-        self.upper = np.zeros(size)
-        self.lower = np.zeros(size)
+        super().__init__()
+        self.size = size
+        # Room for the longest round trip plus one chunk of read-back
+        self.nut_line = DelayLine(4 * size)
+        self.bridge_line = DelayLine(4 * size)
         self.v_c = 0.1
         self.mu_d = 0.01
+        # Tabulated friction curve; rebuilt by set_params when v_c / mu_d change
+        self.friction: FrictionModel = ExponentialFriction(self.v_c, self.mu_d)
 
-    def generate(self, frames: int, frequency: float, sample_rate: float, bow_velocity: float, bow_force: float) -> np.ndarray:
-        L = int(sample_rate / (2 * frequency))
-        L = max(10, min(L, len(self.upper) - 1))
+    def generate(self, frames: int, frequency, sample_rate: float, bow_velocity: float, bow_force: float,
+                 note: float = None) -> np.ndarray:
+        L = sample_rate / (2 * frequency)
+        if np.ndim(L):
+            L = np.clip(L, 10.0, self.size - 1.0)
+        else:
+            L = max(10.0, min(L, self.size - 1.0))
         
-        output = np.zeros(frames)
-        # Optimized inner loop
-        for t in range(frames):
-            # Delays
-            u_temp = self.upper[0]
-            self.upper[1:L] = self.upper[0:L-1]
-            self.lower[0:L-1] = self.lower[1:L]
+        # Bow sits a quarter of the string length from the nut (at full quality)
+        d_nut = L * self.bow_positions[self.quality]
+        d_bridge = L - d_nut
+        # The shortest round trip in the block bounds the chunk
+        chunk = max(1, int(np.ceil(2 * np.min(d_nut))) - 1)
+        per_sample = np.ndim(L) > 0
+        friction_curve = self.friction
+        friction_curve.set_params(self.v_c, self.mu_d)
+        output = np.empty(frames)
+        
+        for start in range(0, frames, chunk):
+            n = min(chunk, frames - start)
             
-            # Refection
-            self.upper[0] = -self.lower[0]
-            self.lower[L-1] = -self.upper[L-1]
+            # Waves arriving back at the bow after an inverting reflection
+            if per_sample:
+                mid = start + n // 2
+                v_right = -self.nut_line.read(float(2 * d_nut[mid]), n)
+                v_left = -self.bridge_line.read(float(2 * d_bridge[mid]), n)
+            else:
+                v_right = -self.nut_line.read(2 * d_nut, n)
+                v_left = -self.bridge_line.read(2 * d_bridge, n)
             
             # Friction at bow
-            bow_pos = L // 4
-            v_string = self.upper[bow_pos] + self.lower[bow_pos]
+            v_string = v_right + v_left
             v_rel = v_string - (bow_velocity * 0.2) # Scaled
             
-            friction = v_rel * np.exp(-1.0 * (v_rel / self.v_c)**2) + self.mu_d
+            friction = friction_curve(v_rel)
+            friction_curve.update(v_rel, friction)
             force = friction * bow_force * 0.05
             
-            self.upper[bow_pos] -= force
-            self.lower[bow_pos] -= force
-            
-            output[t] = self.lower[L-1]
+            self.bridge_line.write(v_right - force)
+            self.nut_line.write(v_left - force)
             
+            # Reflected wave at the bridge for the samples of this chunk
+            d_out = d_bridge[start:start + n] if per_sample else d_bridge
+            output[start:start + n] = -self.bridge_line.read(d_out + n, n)
+        
         return output * 50.0 # Gain compensation
 
+    def reset(self):
+        self.nut_line.reset()
+        self.bridge_line.reset()
+        self.friction.reset()
+
 class FDTDSource(ExcitationSource):
-    def __init__(self, nodes=200):
-        self.nodes = nodes
-        self.u = np.zeros(nodes)
-        self.u_prev = np.zeros(nodes)
+    """
+    Finite-difference string solver (fixed ends, bow drive at 1/4 length).
+    The node count follows the CFL condition c * dt / dx <= 1 for the played
+    note. Since the update is linear, `sub_block` steps are folded into
+    precomputed operators (state transition, output and drive responses),
+    so one Python iteration advances a whole sub-block with a few matmuls.
+    Leftover steps use the explicit scheme on three rotating node buffers.
+    A frequency trajectory drives the bow point with its cumulative phase;
+    the grid follows the block mean snapped to the nearest semitone of the
+    played note, so vibrato and glides reuse cached operators instead of
+    rebuilding them, and a steady note keeps its exact tuning.
+    Lower quality levels use a coarser grid (fewer nodes, same pitch); the
+    block operators cost about nodes^2.
+    Building operators takes tens of milliseconds, so prepare() builds them
+    for every quality level of the notes to be played off the audio
+    thread, before adaptive quality can select that level; the synthesizer
+    publishes them with the parameter snapshot and generate() only builds
+    one itself for a grid nobody prepared.
+    """
+    node_scales = (1.0, 0.7, 0.5, 0.35)
+    quality_costs = tuple(scale**2 for scale in node_scales)
+    # Built operators kept for reuse; the least recently used go first beyond this
+    max_operators = 64
+
+    def __init__(self, max_nodes=400, sub_block=64):
+        super().__init__()
+        self.max_nodes = max_nodes
+        self.sub_block = sub_block
         self.damping = 0.9995
+        self.nodes = 0
+        
+        # Rotating u_prev / u / u_next buffers for explicit stepping
+        self.buffers = np.zeros((3, max_nodes))
+        self.i_prev, self.i_cur, self.i_next = 0, 1, 2
+        # Stacked [u, u_prev] work vectors for the block operator
+        self.state = np.zeros(2 * max_nodes)
+        self.state_next = np.zeros(2 * max_nodes)
+        
+        # (nodes, r2, steps) -> operators, in least recently used order
+        self.operators = OrderedDict()
+        # Operators of the current snapshot (see Synthesizer._publish), looked up first
+        self.prepared = {}
+        # (grid pitch, sample rate) of the last block, for ready()
+        self.grid = None
+        # Measured solver throughput (moving average over generate() calls, 0 until measured)
+        self.samples_per_second = 0.0
+
+    def _cfl_nodes(self, frequency: float, sample_rate: float, level: int) -> int:
+        c = 2.0 * frequency
+        return int(max(8, min(self.max_nodes, np.floor(sample_rate / c * self.node_scales[level]))))
 
-    def generate(self, frames: int, frequency: float, sample_rate: float, bow_velocity: float, bow_force: float) -> np.ndarray:
-        nodes = self.nodes
+    def _operator_key(self, frequency: float, sample_rate: float, level: int) -> Tuple[int, float, int]:
+        nodes = self._cfl_nodes(frequency, sample_rate, level)
         dx = 1.0 / nodes
         dt = 1.0 / sample_rate
         c = 2.0 * frequency
+        # Above sample_rate / 16 the node floor in _cfl_nodes would break the
+        # CFL bound; hold the Courant number at 1 there (pitch goes flat instead of unstable)
+        r2 = min((c * dt / dx)**2, 1.0)
+        return nodes, r2, self.sub_block
+
+    @staticmethod
+    def nearest_semitone(frequency: float, note: float = 440.0) -> float:
+        """
+        `frequency` snapped to the equal-tempered semitones around `note`;
+        `note` itself when that is nearest, otherwise rounded to 0.01 Hz so
+        notes a whole number of semitones apart share grids.
+        """
+        k = round(12.0 * np.log2(frequency / note))
+        return note if k == 0 else round(note * 2.0 ** (k / 12.0), 2)
+
+    def prepare(self, frequencies, sample_rate: float, published: Dict = None) -> Dict:
+        """
+        Builds (or takes from `published` or the cache) the block operators
+        of every quality level for each grid pitch in `frequencies` and
+        returns them as {key: operators}; `published` itself when it already
+        holds exactly those. Meant for the parameter writers, not the audio thread.
+        """
+        published = published or {}
+        keys = {self._operator_key(frequency, sample_rate, level)
+                for frequency in frequencies for level in range(self.quality_levels)}
+        if keys == published.keys():
+            return published
+        return {key: published[key] if key in published else self._get_operators(*key) for key in keys}
+
+    def ready(self, level: int) -> bool:
+        if self.grid is None:
+            return True
+        key = self._operator_key(*self.grid, level)
+        return key in self.prepared or key in self.operators
+
+    def _resize(self, nodes: int):
+        """Re-grids the current string shape when the note changes the node count."""
+        if self.nodes:
+            x_old = np.linspace(0.0, 1.0, self.nodes)
+            x_new = np.linspace(0.0, 1.0, nodes)
+            for i in (self.i_prev, self.i_cur):
+                resampled = np.interp(x_new, x_old, self.buffers[i, :self.nodes])
+                self.buffers[i, :] = 0.0
+                self.buffers[i, :nodes] = resampled
+        self.nodes = nodes
+
+    def _transition(self, nodes: int, r2: float):
+        """One-step state-space model s[n+1] = A s[n] + B d[n], y[n] = C s[n+1] with s = [u, u_prev]."""
+        A = np.zeros((2 * nodes, 2 * nodes))
+        interior = np.arange(1, nodes - 1)
+        A[interior, interior] = self.damping * (2.0 - 2.0 * r2)
+        A[interior, interior + 1] = self.damping * r2
+        A[interior, interior - 1] = self.damping * r2
+        A[interior, nodes + interior] = -self.damping
+        A[nodes + np.arange(nodes), np.arange(nodes)] = 1.0
+        
+        B = np.zeros(2 * nodes)
+        B[nodes // 4] = self.damping
+        C = np.zeros(2 * nodes)
+        C[nodes - 2] = 1.0
+        return A, B, C
+
+    def _get_operators(self, nodes: int, r2: float, steps: int):
+        key = (nodes, r2, steps)
+        ops = self.prepared.get(key)
+        if ops is not None:
+            return ops
+        # The cache is shared by the writers (prepare) and the audio thread;
+        # each OrderedDict call is atomic, so a key evicted in between is just a miss
+        ops = self.operators.get(key)
+        if ops is not None:
+            try:
+                self.operators.move_to_end(key)
+            except KeyError:
+                pass
+            return ops
+        
+        A, B, C = self._transition(nodes, r2)
+        # Output rows C A^(k+1), drive columns A^k B and impulse response h[k] = C A^k B
+        obs = np.zeros((steps, 2 * nodes))
+        drive_cols = np.zeros((2 * nodes, steps))
+        row = C @ A
+        col = B.copy()
+        h = np.zeros(steps)
+        for k in range(steps):
+            obs[k] = row
+            drive_cols[:, steps - 1 - k] = col
+            h[k] = C @ col
+            row = row @ A
+            col = A @ col
+        k_idx = np.arange(steps)
+        lag = k_idx[:, None] - k_idx[None, :]
+        drive_out = np.where(lag >= 0, h[np.clip(lag, 0, None)], 0.0)
+        
+        ops = (np.linalg.matrix_power(A, steps), drive_cols, obs, drive_out)
+        self.operators[key] = ops
+        while len(self.operators) > self.max_operators:
+            self.operators.popitem(last=False)
+        return ops
+
+    def _step(self, r2: float, drive: float) -> float:
+        """Explicit update on the rotating buffers; returns the output node."""
+        n = self.nodes
+        u = self.buffers[self.i_cur, :n]
+        u_prev = self.buffers[self.i_prev, :n]
+        u_next = self.buffers[self.i_next, :n]
+        
+        # Wave equation update
+        np.subtract(u[2:], 2 * u[1:-1], out=u_next[1:-1])
+        u_next[1:-1] += u[:-2]
+        u_next[1:-1] *= r2
+        u_next[1:-1] += 2 * u[1:-1]
+        u_next[1:-1] -= u_prev[1:-1]
+        
+        # Simple driving force at bow position
+        u_next[n // 4] += drive
         
-        r2 = (c * dt / dx)**2
-        if r2 > 1.0:
-            r2 = 0.99
+        # Damping and boundaries
+        u_next *= self.damping
+        u_next[0] = 0
+        u_next[-1] = 0
+        
+        self.i_prev, self.i_cur, self.i_next = self.i_cur, self.i_next, self.i_prev
+        return u_next[-2]
+
+    def generate(self, frames: int, frequency, sample_rate: float, bow_velocity: float, bow_force: float,
+                 note: float = None) -> np.ndarray:
+        t_start = time.perf_counter()
+        if np.ndim(frequency):
+            drive_phase = 2 * np.pi * (np.cumsum(frequency) - frequency) / sample_rate
+            frequency = self.nearest_semitone(np.mean(frequency), note or 440.0)
+        else:
+            drive_phase = 2 * np.pi * frequency * np.arange(frames) / sample_rate
+        self.grid = (frequency, sample_rate)
+        nodes, r2, m = self._operator_key(frequency, sample_rate, self.quality)
+        if nodes != self.nodes:
+            self._resize(nodes)
         
         output = np.zeros(frames)
-        bow_idx = nodes // 4
         
         # Simplified excitation: velocity-driven force
         drive_strength = bow_velocity * bow_force * 0.5
+        drive = drive_strength * np.sin(drive_phase)
         
-        for t in range(frames):
-            u_next = np.zeros(nodes)
-            
-            # Wave equation update
-            u_next[1:-1] = (2 * self.u[1:-1] - self.u_prev[1:-1] + 
-                            r2 * (self.u[2:] - 2 * self.u[1:-1] + self.u[:-2]))
-            
-            # Simple driving force at bow position
-            u_next[bow_idx] += drive_strength * np.sin(2 * np.pi * frequency * t * dt)
-            
-            # Damping and boundaries
-            u_next *= self.damping
-            u_next[0] = 0
-            u_next[-1] = 0
-            
-            self.u_prev[:] = self.u[:]
-            self.u[:] = u_next[:]
-            
-            output[t] = self.u[-2]
+        n_full = (frames // m) * m
+        if n_full:
+            transition, drive_cols, obs, drive_out = self._get_operators(nodes, r2, m)
+            s = self.state[:2 * nodes]
+            s_next = self.state_next[:2 * nodes]
+            s[:nodes] = self.buffers[self.i_cur, :nodes]
+            s[nodes:] = self.buffers[self.i_prev, :nodes]
+            for start in range(0, n_full, m):
+                d = drive[start:start + m]
+                y = output[start:start + m]
+                np.matmul(obs, s, out=y)
+                y += drive_out @ d
+                np.matmul(transition, s, out=s_next)
+                s_next += drive_cols @ d
+                s, s_next = s_next, s
+            self.buffers[self.i_cur, :nodes] = s[:nodes]
+            self.buffers[self.i_prev, :nodes] = s[nodes:]
+        
+        for t in range(n_full, frames):
+            output[t] = self._step(r2, drive[t])
+        
+        elapsed = time.perf_counter() - t_start
+        if elapsed > 0:
+            rate = frames / elapsed
+            self.samples_per_second = rate if not self.samples_per_second else 0.9 * self.samples_per_second + 0.1 * rate
             
         return output * 10000.0
 
+    def reset(self):
+        self.buffers[:] = 0.0
+        self.nodes = 0
+        self.grid = None
+
+@dataclass(frozen=True)
+class SynthParams:
+    """
+    Immutable snapshot of everything the audio callback reads.
+    Setters publish a new snapshot by swapping the reference, so the audio
+    thread reads all parameters with a single attribute load and never
+    waits on a lock.
+    """
+    frequency: Any = 196.0
+    excitation_type: str = "sawtooth"
+    bow_velocity: float = 0.5
+    bow_force: float = 0.5
+    response_mode: str = "MODEL"
+    noise_level: float = 0.0
+    smoothing_level: float = 0.0
+    body_engine: str = "convolution"
+    modes: Tuple[Dict[str, float], ...] = ()
+    # Compiled form of a melody given as `frequency`, None for a single note
+    schedule: Optional[NoteSchedule] = None
+    # Frequencies of a double-stop / chord; overrides `frequency` when set
+    chord: Tuple[float, ...] = ()
+    # Vibrato depth as a fraction of the frequency, rate in Hz
+    vibrato_depth: float = 0.0
+    vibrato_rate: float = 5.5
+    # Glide time constant in seconds between notes (0 = instant)
+    portamento: float = 0.0
+    # Step excitation quality to keep this fraction of the block period free
+    adaptive_quality: bool = True
+    quality_headroom: float = 0.3
+    # Undriven G3/D4/A4/E5 strings resonating with the bridge signal
+    sympathetic_strings: bool = False
+    sympathetic_coupling: float = 0.3
+    # Bow friction curve of the waveguide (see friction.FRICTION_MODELS),
+    # and its tables built by set_friction_model, one model per voice
+    # (empty until the first change: the sources keep their own)
+    friction_model: str = "exponential"
+    frictions: Tuple[FrictionModel, ...] = ()
+    # Room stage after the body: convolver for the loaded room response and wet level
+    room: Optional[RoomConvolver] = None
+    room_mix: float = 0.3
+    # FDTD block operators for every quality level of the notes above,
+    # built by the writer (see FDTDSource.prepare); empty for other excitations
+    fdtd_operators: Dict = field(default_factory=dict)
+    # Bumped whenever a field that shapes the body response changes
+    response_version: int = 0
+    # Body response built for this snapshot at the configured block size,
+    # (key, engine, data) as returned by Synthesizer._build_response
+    response: Optional[Tuple] = None
+
+# Snapshot fields that decide which FDTD grids the callback will need
+NOTE_FIELDS = frozenset(("frequency", "schedule", "chord", "excitation_type", "vibrato_depth", "portamento"))
+
 class Synthesizer:
-    def __init__(self, sample_rate=44100):
+    def __init__(self, sample_rate=44100, blocksize=1024, dtype=np.float64, partition_size=None):
         self.sample_rate = sample_rate
+        # Precision of the render path after the excitation (body, HPF,
+        # normalization, limiter). np.float32 halves memory traffic and runs
+        # the FFTs in single precision; excitation models keep float64 state.
+        self.dtype = np.dtype(dtype)
+        self.complex_dtype = np.result_type(self.dtype, np.complex64)
         self.sample_count = 0
-        self.frequency = 196.0 
-        self.modes = []
+        # Pitch the portamento glide has reached (None until the first note)
+        self.glide_freq = None
+        # Adaptive quality state (audio thread only): EMA of the non-excitation
+        # callback time, consecutive over-budget blocks, last change position
+        self.rest_cost = None
+        self.overloaded_blocks = 0
+        self.last_quality_change = 0
+        # Seconds at a level before stepping back up
+        self.quality_hold = 2.0
+        # Current parameter snapshot. Writers serialize on `lock`; the audio
+        # callback only ever loads `params` once per block.
+        self.params = SynthParams()
         self.lock = threading.Lock()
-        self.stream = None
+        self.backend = None
         self.is_running = False
-        self.audio_queue = queue.Queue(maxsize=10)
-        self.response_mode = "MODEL" 
-        self.noise_level = 0.0 
-        self.smoothing_level = 0.0
+        # Output tap for the spectrogram (~1.5 s at 44.1 kHz)
+        self.audio_tap = AudioRingBuffer(65536)
+        # Session recording (see start_capture()); None when not recording
+        self.capture = None
+        
+        # Callback timing histograms and xrun log (see stats())
+        self.callback_stats = CallbackStats()
+        self.blocksize = blocksize
+        # Per-callback work buffers, reallocated only when the block size changes
+        self.source_buf = None
+        self.signal_buf = None
+        self.spectrum_buf = None
+        
+        # Body response the audio thread built for a block size other than
+        # the configured one (the configured one comes with the snapshot,
+        # see SynthParams.response), keyed by (response_version, frames, sample_rate).
+        self.response_cache = None
+        
+        # Body Engine: "convolution" streams the excitation through the body
+        # impulse response (overlap-save), "modal" runs one resonator per
+        # mode, "fft" filters each block on its own.
+        # Convolution partition size as requested (None follows the block
+        # size, see _partition_size); a block size that is not a multiple
+        # of it makes the convolvers buffer one partition of latency.
+        if partition_size is not None:
+            self._check_size("Partition size", partition_size)
+        self.partition_setting = partition_size
+        self.partition_size = self._partition_size(blocksize)
+        # Body impulse response length: 16384 samples at 44.1 kHz, same duration at other rates
+        self.ir_length = int(round(16384 * sample_rate / 44100))
+        self.body_convolver = PartitionedConvolver(np.zeros(self.ir_length), self.partition_size, self.blocksize, self.dtype)
+        self.modal_bank = ModalResonatorBank()
+        self.sympathetic = SympatheticStrings()
+        self.sympathetic.prepare(self.blocksize, self.sample_rate, self.dtype)
         
         # Excitation Selection
-        self.excitation_type = "sawtooth"
-        self.excitation_sources = {
-            "sawtooth": SawtoothSource(),
-            "waveguide": WaveguideSource(),
-            "fdtd": FDTDSource()
-        }
-        self.bow_velocity = 0.5
-        self.bow_force = 0.5
+        # A fixed pool of voices, each with its own sources; voice 0 plays
+        # single notes and melodies, chords use as many voices as notes.
+        self.voice_pool = VoicePool(8, self._make_sources)
+        self.excitation_sources = self.voice_pool.voices[0].sources
+        # FDTD block operators only depend on the grid, so voices share them
+        for voice in self.voice_pool.voices:
+            voice.sources["fdtd"].operators = self.excitation_sources["fdtd"].operators
         
-        # High-pass filter state for removing sub-audio rumble
-        self.hpf_x_prev = 0.0
-        self.hpf_y_prev = 0.0
+        # High-pass filter for removing sub-audio rumble
+        self.hpf = IIRSection.dc_blocker(self._hpf_alpha(), self.dtype)
+        # Room response as installed, at its own rate `room_rate`; every
+        # rebuild resamples from this copy so rate changes do not accumulate
+        self.room_impulse = None
+        self.room_rate = None
         
         # Sampled SPL Data
         self.sampled_spl = None
         self.raw_sampled_spl = None
         self.sampled_freqs = None
         self._load_sampled_spl()
+        self._refresh_response()
+
+    @staticmethod
+    def _make_sources():
+        return {
+            "sawtooth": SawtoothSource(),
+            "waveguide": WaveguideSource(),
+            "fdtd": FDTDSource()
+        }
+
+    def _hpf_alpha(self) -> float:
+        # First-order IIR: y[n] = x[n] - x[n-1] + alpha * y[n-1]
+        # alpha = 0.994 gives cutoff ~40 Hz at 44.1kHz (well below G3 = 196 Hz);
+        # the same pole time constant keeps that cutoff at other rates
+        return 0.994 ** (44100.0 / self.sample_rate)
+
+    def configure(self, sample_rate: int = None, blocksize: int = None, partition_size: int = None):
+        """
+        Changes the sample rate, block size and/or convolution partition
+        size at run time. Everything that depends on them is rebuilt here,
+        outside the audio thread: the body convolver and cached response,
+        the HPF coefficient, the note schedule, the room (resampled), and
+        the FFT plans and resonator operators for the new block size. A
+        running stream is restarted on the same backend; signal state starts
+        from silence. Sizes that are not positive integers raise ValueError.
+        """
+        sample_rate = sample_rate or self.sample_rate
+        blocksize = blocksize or self.blocksize
+        self._check_size("Block size", blocksize)
+        if partition_size is not None:
+            self._check_size("Partition size", partition_size)
+        setting = self.partition_setting if partition_size is None else partition_size
+        if sample_rate == self.sample_rate and blocksize == self.blocksize and setting == self.partition_setting:
+            return
+        if self.capture is not None and sample_rate != self.sample_rate:
+            raise RuntimeError("Stop the recording before changing the sample rate")
+        if self.is_running and not self.backend.restartable:
+            raise RuntimeError(f"{type(self.backend).__name__} cannot be restarted; stop it before changing settings")
+        was_running = self.is_running
+        if was_running:
+            self.stop()
+        
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.partition_setting = setting
+        self.partition_size = self._partition_size(blocksize)
+        # Spectra built for other block sizes have the old partitioning
+        self.response_cache = None
+        self.ir_length = int(round(16384 * sample_rate / 44100))
+        self.body_convolver = PartitionedConvolver(np.zeros(self.ir_length), self.partition_size, blocksize, self.dtype)
+        self.hpf = IIRSection.dc_blocker(self._hpf_alpha(), self.dtype)
+        
+        p = self.params
+        # Recompiles a melody and rebuilds the FDTD operators for the new rate
+        self._publish(schedule=NoteSchedule(p.frequency, sample_rate) if p.schedule is not None else None)
+        if self.room_impulse is not None:
+            self.set_room_impulse(self.room_impulse, self.room_rate)
+        self._refresh_response()
+        self.sympathetic.prepare(blocksize, sample_rate, self.dtype)
+        # Block FFT of the "fft" engine and the convolver partitions
+        fft.prepare((blocksize, 2 * self.partition_size), self.dtype)
+        
+        self.reset()
+        self.rest_cost = None
+        self.reset_stats()
+        if was_running:
+            self.start(self.backend)
+
+    @staticmethod
+    def _check_size(name: str, size: int):
+        if int(size) != size or size < 1:
+            raise ValueError(f"{name} must be a positive integer, got {size}")
+
+    def _partition_size(self, blocksize: int) -> int:
+        """
+        The requested partition size, or by default the block size up to
+        4096: each partition costs a Python-level FFT round trip, so one
+        partition per block is several times cheaper than small ones.
+        """
+        if self.partition_setting:
+            return int(self.partition_setting)
+        return min(4096, blocksize)
 
     def _load_sampled_spl(self):
         try:
@@ -172,84 +659,153 @@ class Synthesizer:
         except Exception as e:
             print(f"Synthesizer error loading spl.csv: {e}")
 
-    def update_modes(self, modes: List[Dict[str, float]]):
+    def _publish(self, response_changed=False, **changes):
+        """
+        Publishes a new parameter snapshot (atomic reference swap). When the
+        body response changes, it is rebuilt here, on the calling thread,
+        and published in the same snapshot, so the callback never sees a
+        version without its response. The same goes for the FDTD operators
+        when the notes change.
+        """
         with self.lock:
-            self.modes = modes
+            params = self.params
+            if response_changed:
+                changes['response_version'] = params.response_version + 1
+            params = replace(params, **changes)
+            if response_changed:
+                params = replace(params, response=self._build_response(params, self.blocksize))
+            if not NOTE_FIELDS.isdisjoint(changes):
+                params = replace(params, fdtd_operators=self._prepare_fdtd(params))
+            self.params = params
+
+    def _prepare_fdtd(self, p: SynthParams) -> Dict:
+        """
+        FDTD operators for the grids snapshot `p` can play: each note, and
+        with vibrato or portamento every semitone of that note the
+        trajectory can snap to (from the glide start to the vibrato peaks;
+        chord voices do not glide).
+        """
+        if p.excitation_type != "fdtd":
+            return {}
+        if p.chord:
+            notes = list(p.chord)
+        elif p.schedule is not None:
+            notes = list(p.schedule.freqs)
+        else:
+            notes = [float(p.frequency)]
+        grids = set(notes)
+        if p.vibrato_depth > 0 or p.portamento > 0:
+            glide = p.portamento > 0 and not p.chord
+            low, high = min(notes), max(notes)
+            if glide and self.glide_freq is not None:
+                low, high = min(low, self.glide_freq), max(high, self.glide_freq)
+            for note in notes:
+                lo, hi = (low, high) if glide else (note, note)
+                k_low = round(12.0 * np.log2(lo * (1.0 - p.vibrato_depth) / note))
+                k_high = round(12.0 * np.log2(hi * (1.0 + p.vibrato_depth) / note))
+                grids.update(FDTDSource.nearest_semitone(note * 2.0 ** (k / 12.0), note) for k in range(k_low, k_high + 1))
+        # Operators already published are reused, so settings that leave the
+        # grids alone (most slider ticks) rebuild nothing
+        return self.excitation_sources["fdtd"].prepare(sorted(grids), self.sample_rate, p.fdtd_operators)
+
+    def update_modes(self, modes: List[Dict[str, float]]):
+        self._publish(response_changed=True, modes=tuple(modes))
             
-    def set_frequency(self, freq: float):
-        with self.lock:
-            self.frequency = freq
+    def set_frequency(self, freq):
+        """A single frequency, or a looping melody [(freq, duration_seconds), ...]."""
+        schedule = NoteSchedule(freq, self.sample_rate) if isinstance(freq, (list, tuple)) else None
+        self._publish(frequency=freq, schedule=schedule, chord=())
+
+    def set_chord(self, freqs):
+        """Plays all `freqs` at once (double-stops, chords) on up to 8 voices; an empty chord returns to `frequency`."""
+        self._publish(chord=tuple(float(f) for f in freqs))
 
     def set_response_mode(self, mode: str):
-        with self.lock:
-            self.response_mode = mode
+        self._publish(response_changed=True, response_mode=mode)
 
     def set_noise_level(self, level: float):
-        with self.lock:
-            self.noise_level = level
+        self._publish(response_changed=True, noise_level=level)
 
     def set_smoothing_level(self, level: float):
-        with self.lock:
-            self.smoothing_level = level
+        self._publish(response_changed=True, smoothing_level=level)
 
     def set_excitation_type(self, ext_type: str):
-        with self.lock:
-            self.excitation_type = ext_type
+        self._publish(excitation_type=ext_type)
+
+    def set_body_engine(self, engine: str):
+        self._publish(response_changed=True, body_engine=engine)
 
     def set_bow_params(self, velocity: float, force: float):
-        with self.lock:
-            self.bow_velocity = velocity
-            self.bow_force = force
+        self._publish(bow_velocity=velocity, bow_force=force)
 
-    def _audio_callback(self, outdata, frames, time, status):
-        vibrato_speed = 5.5
-        vibrato_depth = 0.0  # Disabled - was causing low-freq rumble when interacting with SPL filtering
-        
-        t_arr = (self.sample_count + np.arange(frames)) / self.sample_rate
-        
-        with self.lock:
-            if isinstance(self.frequency, (list, tuple)):
-                # Melody Mode: cycle through notes
-                # note = (freq, duration_seconds)
-                total_duration = sum(n[1] for n in self.frequency)
-                current_time = (self.sample_count / self.sample_rate) % total_duration
-                
-                # Find current note
-                elapsed = 0
-                f_base = self.frequency[0][0]
-                for freq, dur in self.frequency:
-                    if elapsed <= current_time < elapsed + dur:
-                        f_base = freq
-                        break
-                    elapsed += dur
-            else:
-                f_base = self.frequency
-
-            vib = 1.0 + vibrato_depth * np.sin(2 * np.pi * vibrato_speed * t_arr)
-            f_current = f_base * vib
-            ext_type = self.excitation_type
-            v_bow = self.bow_velocity
-            f_bow = self.bow_force
-            mode_choice = self.response_mode
-            noise_val = self.noise_level
-            smooth_val = self.smoothing_level
-            current_modes = list(self.modes)
-        
-        # 1. Generate Excitation
-        source_gen = self.excitation_sources.get(ext_type, self.excitation_sources["sawtooth"])
-        source = source_gen.generate(frames, f_current[0], self.sample_rate, v_bow, f_bow)
-        
-        self.sample_count += frames
+    def set_vibrato(self, depth: float, rate: float = 5.5):
+        self._publish(vibrato_depth=depth, vibrato_rate=rate)
 
-        # 2. Body Resonance Filtering (FFT Method)
-        spectrum = np.fft.rfft(source)
-        freqs = np.fft.rfftfreq(frames, 1/self.sample_rate)
-        
+    def set_portamento(self, glide_time: float):
+        self._publish(portamento=glide_time)
+
+    def set_friction_model(self, name: str):
+        if name not in FRICTION_MODELS:
+            raise ValueError(f"Unknown friction model: {name}")
+        # Tables are built here; the callback only swaps references
+        frictions = tuple(FRICTION_MODELS[name](voice.sources["waveguide"].v_c, voice.sources["waveguide"].mu_d)
+                          for voice in self.voice_pool.voices)
+        self._publish(friction_model=name, frictions=frictions)
+
+    def set_room_impulse(self, impulse_response: Optional[np.ndarray], rate: int = None):
+        """Installs a room impulse response sampled at `rate` (the current sample rate by default; None removes the room stage)."""
+        room = None
+        self.room_impulse = impulse_response
+        self.room_rate = rate or self.sample_rate
+        if impulse_response is not None:
+            impulse_response = resample(impulse_response, self.room_rate, self.sample_rate)
+            room = RoomConvolver(impulse_response, self.partition_size, block_size=self.blocksize, dtype=self.dtype)
+        old = self.params.room
+        self._publish(room=room)
+        if old is not None:
+            old.close()
+
+    def load_room_impulse(self, path: str):
+        """Loads a room impulse response from a WAV file (any rate, mono or multichannel)."""
+        self.set_room_impulse(*read_impulse_response(path))
+
+    def set_room_mix(self, mix: float):
+        self._publish(room_mix=mix)
+
+    def set_sympathetic_strings(self, enabled: bool, coupling: float = 0.3):
+        if enabled:
+            # Design the bank here so the first enabled block does not
+            self.sympathetic.prepare(self.blocksize, self.sample_rate, self.dtype)
+        self._publish(sympathetic_strings=enabled, sympathetic_coupling=coupling)
+
+    def set_adaptive_quality(self, enabled: bool, headroom: float = 0.3):
+        """Headroom is the fraction of the block period the callback should leave unused."""
+        self._publish(adaptive_quality=enabled, quality_headroom=headroom)
+
+    @staticmethod
+    def _smooth_response(response, smooth_val):
+        if smooth_val > 0:
+            mag = np.abs(response)
+            window_size = int(smooth_val * 100)
+            if window_size > 3:
+                if window_size % 2 == 0: window_size += 1
+                mag_smoothed = savgol_filter(mag, window_size, 3)
+                phase = np.angle(response)
+                response = mag_smoothed * np.exp(1j * phase)
+        return response
+
+    def _compute_response(self, freqs, mode_choice, noise_val, smooth_val, modes):
+        """
+        Complex body response on the given frequency grid.
+        In NOISY mode the unsmoothed response is returned; the callback
+        randomizes and smooths it per block.
+        """
         if mode_choice == "FLAT":
             # Flat line with slight realistic HF roll-off
             mag = (0.2 - 0.1 * (freqs / 10000.0)**2).astype(complex)
-            response = mag
-        elif mode_choice == "SAMPLED" and self.raw_sampled_spl is not None:
+            return mag
+        
+        if mode_choice == "SAMPLED" and self.raw_sampled_spl is not None:
             mag_data = self.raw_sampled_spl.copy()
             if smooth_val > 0:
                 window_size = int(smooth_val * 100)
@@ -264,89 +820,409 @@ class Synthesizer:
             if np.any(mask):
                 mag[mask] *= (freqs[mask] / f_floor)**3
                 
-            response = mag.astype(complex) * 0.1
-        else:
-            # Physical Baseline: Low-Frequency high-pass roll-off for radiation
-            f_hpf_floor = 200.0
-            floor_mag = 0.05 * (freqs / f_hpf_floor)**2 / (1 + (freqs / f_hpf_floor)**2 + 1e-6)
-            response = floor_mag.astype(complex)
-            
-            for mode in current_modes:
-                fc, amp, damp = mode['freq'], mode['amp'], mode['damping']
-                if fc > 20000: continue
-                bw = damp * fc
-                denominator = 1 + 1j * (freqs - fc) / (bw/2 + 1e-6)
-                response += amp / denominator
-            
-            # Global Radiation High-Pass (Violin acts as a dipole/monopole with LF roll-off)
-            # Targeted to hit approx -20dB at 100Hz
-            f_rad = 400.0
-            hp_roll = (freqs / f_rad)**3 / (1 + (freqs / f_rad)**3)
-            response *= hp_roll
+            return mag.astype(complex) * 0.1
+        
+        # Physical Baseline: Low-Frequency high-pass roll-off for radiation
+        f_hpf_floor = 200.0
+        floor_mag = 0.05 * (freqs / f_hpf_floor)**2 / (1 + (freqs / f_hpf_floor)**2 + 1e-6)
+        response = floor_mag.astype(complex)
+        
+        for mode in modes:
+            fc, amp, damp = mode['freq'], mode['amp'], mode['damping']
+            if fc > 20000: continue
+            bw = damp * fc
+            denominator = 1 + 1j * (freqs - fc) / (bw/2 + 1e-6)
+            response += amp / denominator
+        
+        # Global Radiation High-Pass (Violin acts as a dipole/monopole with LF roll-off)
+        # Targeted to hit approx -20dB at 100Hz
+        f_rad = 400.0
+        hp_roll = (freqs / f_rad)**3 / (1 + (freqs / f_rad)**3)
+        response *= hp_roll
+        
+        if mode_choice == "NOISY" and noise_val > 0:
+            return response
+        return self._smooth_response(response, smooth_val)
+
+    def _refresh_response(self):
+        """Rebuilds and publishes the body response for the current settings (sample rate, block size)."""
+        with self.lock:
+            self.params = replace(self.params, response=self._build_response(self.params, self.blocksize))
 
+    def _build_response(self, p: SynthParams, frames: int):
+        """
+        Body response of snapshot `p` for `frames`-sample blocks, as
+        (key, engine, data) where data is the complex block response
+        ("fft"), the impulse response partition spectra ("convolution") or
+        the resonator bank operators ("modal").
+        """
+        version = p.response_version
+        engine = p.body_engine
+        mode_choice = p.response_mode
+        noise_val = p.noise_level
+        smooth_val = p.smoothing_level
+        current_modes = list(p.modes)
+        
+        # The resonator bank only knows the modal model
+        if engine == "modal" and (mode_choice not in ("MODEL", "NOISY") or not current_modes):
+            engine = "convolution"
+        
+        if engine == "modal":
             if mode_choice == "NOISY" and noise_val > 0:
-                noise = (np.random.rand(len(freqs)) - 0.5) * noise_val * 2.0
-                response = response * (1.0 + noise)
+                # One fixed randomization of the mode amplitudes
+                noise = (np.random.rand(len(current_modes)) - 0.5) * noise_val * 2.0
+                current_modes = [dict(m, amp=m['amp'] * (1.0 + n)) for m, n in zip(current_modes, noise)]
+            data = ModalResonatorBank.design(current_modes, frames, self.sample_rate, self.dtype)
+        elif engine == "convolution":
+            # Impulse response on a finer grid.
+            # NOISY gets one fixed randomization here instead of one per block.
+            ir_freqs = fft.rfftfreq(self.ir_length, 1/self.sample_rate)
+            ir_response = self._compute_response(ir_freqs, mode_choice, noise_val, smooth_val, current_modes)
+            if mode_choice == "NOISY" and noise_val > 0:
+                noise = (np.random.rand(len(ir_freqs)) - 0.5) * noise_val * 2.0
+                ir_response = self._smooth_response(ir_response * (1.0 + noise), smooth_val)
+            impulse_response = response_to_impulse(ir_response, self.ir_length)
+            data = PartitionedConvolver.partition_spectra(impulse_response, self.partition_size, self.dtype)
+        else:
+            freqs = fft.rfftfreq(frames, 1/self.sample_rate)
+            data = self._compute_response(freqs, mode_choice, noise_val, smooth_val, current_modes).astype(self.complex_dtype)
+        
+        return ((version, frames, self.sample_rate), engine, data)
 
-            if smooth_val > 0:
-                mag = np.abs(response)
-                window_size = int(smooth_val * 100)
-                if window_size > 3:
-                    if window_size % 2 == 0: window_size += 1
-                    mag_smoothed = savgol_filter(mag, window_size, 3)
-                    phase = np.angle(response)
-                    response = mag_smoothed * np.exp(1j * phase)
+    def _work_buffers(self, frames: int):
+        if self.source_buf is None or len(self.source_buf) != frames:
+            self.source_buf = np.zeros(frames, dtype=self.dtype)
+            self.signal_buf = np.zeros(frames, dtype=self.dtype)
+            self.spectrum_buf = np.zeros(frames // 2 + 1, dtype=self.complex_dtype)
+        return self.source_buf, self.signal_buf, self.spectrum_buf
+
+    def _pitch_trajectory(self, f_target: float, start: int, frames: int, p: SynthParams, glide_enabled: bool = True):
+        """
+        Frequency for `frames` samples from absolute sample `start`: the plain
+        scalar for a steady note, otherwise a per-sample array with the
+        portamento glide (exponential in log-frequency) and vibrato applied.
+        Chord voices pass glide_enabled=False (the glide follows one line only).
+        """
+        freq = f_target
+        glide = self.glide_freq
+        if glide_enabled and p.portamento > 0 and glide is not None and abs(glide - f_target) > 1e-3 * f_target:
+            a = np.exp(-1.0 / (p.portamento * self.sample_rate))
+            log_target = np.log(f_target)
+            freq = np.exp(log_target + (np.log(glide) - log_target) * a ** np.arange(1, frames + 1))
+            self.glide_freq = freq[-1]
+        elif glide_enabled:
+            self.glide_freq = f_target
+        
+        if p.vibrato_depth > 0:
+            t = (start + np.arange(frames)) / self.sample_rate
+            freq = freq * (1.0 + p.vibrato_depth * np.sin(2 * np.pi * p.vibrato_rate * t))
+        return freq
+
+    def _audio_callback(self, outdata, frames, time_info, status):
+        clock = time.perf_counter_ns
+        stats = self.callback_stats
+        t_start = clock()
+        stats.record_status(status, self.sample_count)
+        
+        p = self.params
+        if p.schedule is not None:
+            # Melody Mode: one run per note sounding in this block
+            runs = p.schedule.segments(self.sample_count, frames)
+        else:
+            runs = [(0, frames, p.frequency)]
+
+        mode_choice = p.response_mode
+        noise_val = p.noise_level
+        smooth_val = p.smoothing_level
+        t_params = clock()
+        stats.record_stage("params", t_params - t_start)
+        
+        # 1. Generate Excitation
+        source_type = p.excitation_type if p.excitation_type in self.excitation_sources else "sawtooth"
+        source_gen = self._voice_source(self.voice_pool.voices[0], source_type, p)
+        source, signal, spectrum = self._work_buffers(frames)
+        voices = self.voice_pool.assign(p.chord)
+        n_voices = max(1, len(voices))
+        if voices:
+            # Chord: the voices are mixed first so the body filters the sum once
+            source[:] = 0.0
+            for voice in voices:
+                voice_gen = self._voice_source(voice, source_type, p)
+                f_current = self._pitch_trajectory(voice.frequency, self.sample_count, frames, p, glide_enabled=False)
+                source += voice_gen.generate(frames, f_current, self.sample_rate, p.bow_velocity, p.bow_force, voice.frequency)
+        elif len(runs) == 1:
+            # Notes switch at their exact sample; the source carries its state across
+            f_current = self._pitch_trajectory(runs[0][2], self.sample_count, frames, p)
+            source[:] = source_gen.generate(frames, f_current, self.sample_rate, p.bow_velocity, p.bow_force, runs[0][2])
+        else:
+            for offset, n, f_base in runs:
+                f_current = self._pitch_trajectory(f_base, self.sample_count + offset, n, p)
+                source[offset:offset + n] = source_gen.generate(n, f_current, self.sample_rate, p.bow_velocity, p.bow_force, f_base)
+        
+        self.sample_count += frames
+        t_excitation = clock()
+        excitation_ns = t_excitation - t_params
+        stats.record_stage("excitation", excitation_ns)
+        source_gen.record_cost(frames * n_voices, excitation_ns * 1e-9)
+
+        # Sympathetic strings pick up the bridge signal and feed their ringing back into it
+        if p.sympathetic_strings:
+            ringing = self.sympathetic.process(source, self.sample_rate)
+            ringing *= p.sympathetic_coupling
+            source += ringing
+            t_sympathetic = clock()
+            stats.record_stage("sympathetic", t_sympathetic - t_excitation)
+            t_excitation = t_sympathetic
+
+        # 2. Body Resonance Filtering
+        # The snapshot carries the response for the configured block size;
+        # only a different block size (e.g. render(blocksize=...)) builds one here
+        key = (p.response_version, frames, self.sample_rate)
+        cache = p.response
+        if cache is None or cache[0] != key:
+            cache = self.response_cache
+            if cache is None or cache[0] != key:
+                cache = self._build_response(p, frames)
+                self.response_cache = cache
+        _, body_engine, body_data = cache
+        
+        if body_engine == "convolution":
+            # Overlap-save against the body impulse response (no block wrap-around)
+            self.body_convolver.set_spectra(body_data)
+            output_signal = self.body_convolver.process(source, out=signal)
+        elif body_engine == "modal":
+            # Time-domain resonator bank, states carried across blocks
+            output_signal = self.modal_bank.process(source, body_data)
+        else:
+            # Per-block FFT filtering (circular)
+            fft.rfft(source, out=spectrum)
+            t_fft = clock()
+            stats.record_stage("fft", t_fft - t_excitation)
+            response = body_data
+            
+            if mode_choice == "NOISY" and noise_val > 0:
+                # Randomization stays per-block; smoothing has to follow it
+                noise = (np.random.rand(len(response)) - 0.5) * noise_val * 2.0
+                response = self._smooth_response(response * (1.0 + noise), smooth_val)
 
-        filtered_spectrum = spectrum * response
-        output_signal = np.fft.irfft(filtered_spectrum)
+            np.multiply(spectrum, response, out=spectrum)
+            output_signal = fft.irfft(spectrum, frames, out=signal)
+        t_body = clock()
+        stats.record_stage("body", t_body - t_excitation)
+        
+        # Room: wet/dry mix of the body output through the room response.
+        # Offline renders compute the room tail inline instead of on its thread.
+        room = p.room
+        if room is not None and p.room_mix > 0:
+            wet = room.process(output_signal, realtime=self.is_running)
+            wet *= p.room_mix
+            output_signal *= 1.0 - p.room_mix
+            output_signal += wet
+            t_room = clock()
+            stats.record_stage("room", t_room - t_body)
+            t_body = t_room
         
         # High-pass filter to remove sub-audio rumble and low-freq artifacts
-        # First-order IIR: y[n] = x[n] - x[n-1] + alpha * y[n-1]
-        # alpha = 0.994 gives cutoff ~40 Hz at 44.1kHz (well below G3 = 196 Hz)
-        hpf_output = np.zeros(len(output_signal))
-        for i in range(len(output_signal)):
-            hpf_output[i] = output_signal[i] - self.hpf_x_prev + 0.994 * self.hpf_y_prev
-            self.hpf_x_prev = output_signal[i]
-            self.hpf_y_prev = hpf_output[i]
-        output_signal = hpf_output
+        output_signal = self.hpf.process(output_signal)
+        t_hpf = clock()
+        stats.record_stage("hpf", t_hpf - t_body)
         
         # Normalization & Safe Limiting
         # Proactive normalization: scale UP if too quiet, but only if there's actual signal
-        rms = np.sqrt(np.mean(output_signal**2))
+        # (in place: output_signal is a fresh HPF output)
+        rms = np.sqrt(np.dot(output_signal, output_signal) / frames)
         target_rms = 0.1
         if rms > 1e-6:
-            output_signal = output_signal * (target_rms / (rms + 1e-9))
+            output_signal *= target_rms / (rms + 1e-9)
         elif rms > 0:
             # Avoid extreme boosting of silence
-            output_signal = output_signal * (target_rms / (1e-6))
+            output_signal *= target_rms / (1e-6)
+        t_norm = clock()
+        stats.record_stage("normalize", t_norm - t_hpf)
+        
+        output_signal *= 1.5
+        np.tanh(output_signal, out=output_signal)
+        output_signal *= 0.5
+        outdata[:, 0] = output_signal
+        # Only the live stream feeds the spectrogram and the recording;
+        # offline renders would splice in audio faster than real time
+        if self.is_running:
+            self.audio_tap.write(output_signal)
+            capture = self.capture
+            if capture is not None:
+                capture.write(output_signal)
+        t_end = clock()
+        stats.record_stage("limiter", t_end - t_norm)
+        stats.record_callback(t_end - t_start, frames, self.sample_rate)
+        if p.adaptive_quality and self.is_running:
+            self._adapt_quality(p, source_type, frames, n_voices, (t_end - t_start - excitation_ns) * 1e-9)
+
+    def _voice_source(self, voice: Voice, source_type: str, p: SynthParams) -> ExcitationSource:
+        source = voice.sources[source_type]
+        if isinstance(source, FDTDSource):
+            source.prepared = p.fdtd_operators
+        elif isinstance(source, WaveguideSource) and p.frictions and source.friction is not p.frictions[voice.index]:
+            source.friction = p.frictions[voice.index]
+        return source
+
+    def _adapt_quality(self, p: SynthParams, source_type: str, frames: int, n_voices: int, rest_seconds: float):
+        """
+        Steps the excitation quality down as soon as the predicted callback
+        time stays over budget for a few blocks, and back up once the
+        better level is predicted to fit with margin and the current level
+        has been held for `quality_hold` seconds. A level whose operators
+        are not built yet (a grid nobody prepared) is not selected; the
+        current one stays.
+        """
+        self.rest_cost = rest_seconds if self.rest_cost is None else 0.9 * self.rest_cost + 0.1 * rest_seconds
+        source = self.excitation_sources[source_type]
+        if source.quality_levels == 1:
+            return
+        period = frames / self.sample_rate
+        budget = (1.0 - p.quality_headroom) * period
+        level = source.quality
+        # Costs are per voice-sample; all voices run at the same level
+        frames *= n_voices
+        predicted = source.cost_per_sample() * frames + self.rest_cost
         
-        output_signal = np.tanh(output_signal * 1.5) * 0.5
-        outdata[:] = output_signal.reshape(-1, 1)
+        self.overloaded_blocks = self.overloaded_blocks + 1 if predicted > budget else 0
+        if self.overloaded_blocks >= 3 and level < source.quality_levels - 1:
+            new_level = level + 1
+        elif (level > 0 and self.sample_count - self.last_quality_change >= self.quality_hold * self.sample_rate
+              and source.cost_per_sample(level - 1) * frames + self.rest_cost < 0.8 * budget):
+            new_level = level - 1
+        else:
+            return
+        voices = self.voice_pool.active or self.voice_pool.voices[:1]
+        if not all(voice.sources[source_type].ready(new_level) for voice in voices):
+            return
         
-        try:
-            self.audio_queue.put_nowait(output_signal.copy())
-        except queue.Full:
-            pass
+        for voice in self.voice_pool.voices:
+            voice.sources[source_type].set_quality(new_level)
+        self.overloaded_blocks = 0
+        self.last_quality_change = self.sample_count
+        self.callback_stats.record_quality(self.sample_count, p.excitation_type, level, new_level, predicted / period * 100.0)
+
+    def stats(self):
+        """
+        Snapshot of the callback instrumentation: per-stage durations (us),
+        deadline load (% of the block period), deadline misses, xrun counts
+        and the most recent xrun events, plus the excitation quality levels
+        and the log of adaptive quality changes, the room tail blocks
+        that were not ready in time, and the recording progress (or None).
+        """
+        snapshot = self.callback_stats.snapshot()
+        snapshot["excitation_quality"] = {name: source.quality for name, source in self.excitation_sources.items()}
+        snapshot["room_tail_misses"] = self.params.room.tail_misses if self.params.room is not None else 0
+        capture = self.capture
+        snapshot["capture"] = None if capture is None else {
+            "path": capture.path,
+            "seconds": capture.seconds,
+            "dropped": capture.dropped,
+            "overflows": capture.overflows,
+            "error": None if capture.error is None else str(capture.error),
+        }
+        return snapshot
+
+    def reset_stats(self):
+        self.callback_stats.reset()
 
-    def get_audio_chunk(self):
+    def reset(self):
+        """Clears all signal state (excitation, body filter, HPF) and the clock."""
+        self.sample_count = 0
+        self.glide_freq = None
+        self.last_quality_change = 0
+        self.overloaded_blocks = 0
+        self.voice_pool.reset()
+        self.hpf.reset()
+        self.body_convolver.reset()
+        self.modal_bank.reset()
+        self.sympathetic.reset()
+        if self.params.room is not None:
+            self.params.room.reset()
+
+    def render(self, duration: float, note_or_melody=None, blocksize=None, out=None, wav_path=None, reset=True):
+        """
+        Renders `duration` seconds offline, as fast as the CPU allows.
+        The audio is produced by calling the real-time callback on
+        consecutive blocks, so it is bit-identical to what a stream with the
+        same block size would have played at full excitation quality.
+        
+        note_or_melody: frequency or [(freq, duration), ...]; defaults to the current setting.
+        out: optional preallocated float array of at least duration * sample_rate samples.
+        wav_path: optional file the blocks are streamed to as they are rendered.
+        Returns the rendered array (`out` if given), or None when only writing a WAV file.
+        """
+        if self.is_running:
+            raise RuntimeError("Cannot render offline while the audio stream is running")
+        if note_or_melody is not None:
+            self.set_frequency(note_or_melody)
+        if reset:
+            self.reset()
+        # No deadline offline: always render the full-quality models
+        for voice in self.voice_pool.voices:
+            for source in voice.sources.values():
+                source.set_quality(0)
+        
+        blocksize = blocksize or self.blocksize
+        self._check_size("Block size", blocksize)
+        total = int(round(duration * self.sample_rate))
+        if out is None and wav_path is None:
+            out = np.zeros(total, dtype=self.dtype)
+        elif out is not None and len(out) < total:
+            raise ValueError(f"Output buffer holds {len(out)} samples, {total} needed")
+        
+        writer = WavWriter(wav_path, self.sample_rate) if wav_path else None
+        block = np.zeros((blocksize, 1), dtype=self.dtype)
         try:
-            return self.audio_queue.get_nowait()
-        except queue.Empty:
+            # Whole blocks only, so the callback sees the same sizes as a stream
+            for start in range(0, total, blocksize):
+                self._audio_callback(block, blocksize, None, None)
+                n = min(blocksize, total - start)
+                if out is not None:
+                    out[start:start + n] = block[:n, 0]
+                if writer is not None:
+                    writer.write(block[:n, 0])
+        finally:
+            if writer is not None:
+                writer.close()
+            # A block size off the partition grid switched the convolvers to
+            # buffering; don't leave that latency to the next stream
+            if blocksize % self.partition_size:
+                self.body_convolver.reset()
+                if self.params.room is not None:
+                    self.params.room.reset()
+        return out
+
+    def read_audio_tap(self):
+        """Returns (samples, dropped): all output since the last call and how many samples were lost."""
+        return self.audio_tap.read()
+
+    def start_capture(self, path: str, buffer_seconds: float = 8.0):
+        """Starts recording the output to `path` (.wav, or .flac with soundfile installed)."""
+        self.stop_capture()
+        self.capture = AudioCapture(path, self.sample_rate, buffer_seconds, dtype=self.dtype)
+
+    def stop_capture(self) -> Optional[AudioCapture]:
+        """
+        Stops recording, flushes the file and returns the finished capture
+        (None if not recording). A write error is left in capture.error.
+        """
+        capture = self.capture
+        if capture is None:
             return None
+        self.capture = None
+        capture.close()
+        return capture
 
-    def start(self):
+    def start(self, backend: AudioBackend = None):
+        """Starts real-time playback on `backend` (a sounddevice stream by default)."""
         if self.is_running: return
-        self.stream = sd.OutputStream(
-            channels=1, 
-            callback=self._audio_callback,
-            samplerate=self.sample_rate,
-            blocksize=1024
-        )
-        self.stream.start()
+        self.backend = backend or SoundDeviceBackend()
+        self.backend.start(self._audio_callback, self.sample_rate, self.blocksize, channels=1)
         self.is_running = True
 
     def stop(self):
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
+        if self.backend:
+            self.backend.stop()
         self.is_running = False
@@ -0,0 +1,51 @@
+from typing import Callable, Dict, List, Sequence
+
+
+class Voice:
+    """One excitation voice: its own set of excitation sources and the frequency it plays (None when free)."""
+    def __init__(self, sources: Dict, index: int = 0):
+        self.sources = sources
+        self.index = index
+        self.frequency = None
+
+    def reset(self):
+        for source in self.sources.values():
+            source.reset()
+
+
+class VoicePool:
+    """
+    Fixed pool of excitation voices for double-stops and chords.
+    All voices are created up front; the audio callback only re-assigns
+    them. A voice already sounding a requested frequency keeps it (and its
+    state), the remaining frequencies go to free voices after a reset, and
+    voices no longer requested are released. Requests beyond the pool size
+    are dropped.
+    """
+    def __init__(self, n_voices: int, make_sources: Callable[[], Dict]):
+        self.voices = [Voice(make_sources(), i) for i in range(n_voices)]
+        self.active: List[Voice] = []
+        self.frequencies = ()
+
+    def assign(self, frequencies: Sequence[float]) -> List[Voice]:
+        """Returns the active voices for `frequencies`; cheap when the request did not change."""
+        if frequencies == self.frequencies:
+            return self.active
+        self.frequencies = frequencies
+
+        wanted = list(frequencies[:len(self.voices)])
+        for voice in self.voices:
+            if voice.frequency in wanted:
+                wanted.remove(voice.frequency)
+            else:
+                voice.frequency = None
+        for voice in self.voices:
+            if voice.frequency is None and wanted:
+                voice.reset()
+                voice.frequency = wanted.pop(0)
+        self.active = [voice for voice in self.voices if voice.frequency is not None]
+        return self.active
+
+    def reset(self):
+        for voice in self.voices:
+            voice.reset()
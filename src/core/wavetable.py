@@ -0,0 +1,57 @@
+import numpy as np
+from functools import lru_cache
+
+from . import fft
+
+
+class MipMapWavetable:
+    """
+    Band-limited periodic waveform stored as one table per octave.
+    The table for octave i serves fundamentals in [f_min * 2^i, f_min * 2^(i+1))
+    and holds only the harmonics that stay below Nyquist at the top of that
+    range, so no lookup inside the octave can alias. Tables carry one guard
+    sample for linear interpolation and are built once by inverse FFT.
+    """
+    def __init__(self, harmonics: np.ndarray, sample_rate: float, table_size: int = 2048, min_frequency: float = 20.0):
+        # harmonics[k] is the complex amplitude of harmonic k (k >= 1; index 0 ignored)
+        self.sample_rate = sample_rate
+        self.table_size = table_size
+        self.min_frequency = min_frequency
+
+        nyquist = sample_rate / 2.0
+        max_harmonic = min(len(harmonics) - 1, table_size // 2 - 1)
+        tables = []
+        top = 2.0 * min_frequency
+        while True:
+            n = max(1, min(max_harmonic, int(nyquist / top)))
+            spectrum = np.zeros(table_size // 2 + 1, dtype=complex)
+            spectrum[1:n + 1] = harmonics[1:n + 1]
+            table = fft.irfft(spectrum, table_size) * table_size
+            tables.append(np.append(table, table[0]))
+            if n == 1:
+                break
+            top *= 2.0
+        self.tables = np.array(tables)
+
+    def table_index(self, frequency: float) -> int:
+        if frequency <= self.min_frequency:
+            return 0
+        return min(int(np.log2(frequency / self.min_frequency)), len(self.tables) - 1)
+
+    def lookup(self, phases: np.ndarray, frequency: float) -> np.ndarray:
+        """Interpolated read of the octave table for `frequency` at phases in [0, 1)."""
+        table = self.tables[self.table_index(frequency)]
+        pos = phases * self.table_size
+        idx = pos.astype(np.intp)
+        frac = pos - idx
+        return table[idx] + frac * (table[idx + 1] - table[idx])
+
+
+@lru_cache(maxsize=None)
+def sawtooth_wavetable(sample_rate: float, table_size: int = 2048) -> MipMapWavetable:
+    """Rising sawtooth 2 * (phase - 0.5) = -(2 / pi) * sum(sin(2 pi k phase) / k), shared per sample rate."""
+    k = np.arange(table_size // 2)
+    harmonics = np.zeros(table_size // 2, dtype=complex)
+    # sin(2 pi k phase) is the real part of -j * exp(2 pi j k phase); irfft doubles positive bins
+    harmonics[1:] = 1j / (np.pi * k[1:])
+    return MipMapWavetable(harmonics, sample_rate, table_size)
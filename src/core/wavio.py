@@ -0,0 +1,33 @@
+import wave
+import numpy as np
+
+
+class WavWriter:
+    """
+    Streams float audio in [-1, 1] to a 16-bit PCM WAV file chunk by chunk,
+    so long renders never have to be held in memory.
+    """
+    def __init__(self, path: str, sample_rate: int, channels: int = 1):
+        self.path = path
+        self.channels = channels
+        self.frames_written = 0
+        self._file = wave.open(path, 'wb')
+        self._file.setnchannels(channels)
+        self._file.setsampwidth(2)
+        self._file.setframerate(int(sample_rate))
+
+    def write(self, samples: np.ndarray):
+        pcm = np.clip(samples, -1.0, 1.0) * 32767.0
+        self._file.writeframes(pcm.astype('<i2').tobytes())
+        self.frames_written += len(samples)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QComboBox, QGridLayout, QToolButton, QFrame, QSizePolicy
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QComboBox, QGridLayout, QToolButton, QFrame, QSizePolicy, QCheckBox
 from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, QParallelAnimationGroup, QAbstractAnimation
 import numpy as np
 
@@ -65,6 +65,13 @@ class Controls(QWidget):
     excitationModeChanged = pyqtSignal(str)
     bowVelocityChanged = pyqtSignal(float)
     bowForceChanged = pyqtSignal(float)
+    vibratoChanged = pyqtSignal(float)
+    portamentoChanged = pyqtSignal(float)
+    sympatheticStringsChanged = pyqtSignal(bool)
+    frictionModelChanged = pyqtSignal(str)
+    roomImpulseRequested = pyqtSignal()
+    roomMixChanged = pyqtSignal(float)
+    audioSettingsChanged = pyqtSignal(int, int)  # sample rate, block size
     saveSettings = pyqtSignal()
 
     def __init__(self, parent=None):
@@ -96,6 +103,11 @@ class Controls(QWidget):
             (880.00, 1.0)  # A5
         ]
         self.string_combo.addItem("Sibelius Opening", sibelius_melody)
+
+        # Double-stops (played on the voice pool)
+        self.string_combo.addItem("Double Stop G3 + D4", {"chord": (196.0, 293.66)})
+        self.string_combo.addItem("Double Stop D4 + A4", {"chord": (293.66, 440.0)})
+        self.string_combo.addItem("Chord G3 D4 A4 E5", {"chord": (196.0, 293.66, 440.0, 659.25)})
         string_layout.addWidget(self.string_combo)
         self.layout.addWidget(string_container)
         
@@ -192,6 +204,29 @@ class Controls(QWidget):
         h1.addWidget(self.excitation_combo)
         layout.addLayout(h1)
 
+        h_friction = QHBoxLayout()
+        h_friction.addWidget(QLabel("Friction:"))
+        self.friction_combo = QComboBox()
+        self.friction_combo.addItem("Exponential", "exponential")
+        self.friction_combo.addItem("Hyperbolic", "hyperbolic")
+        self.friction_combo.addItem("Plastic (thermal)", "plastic")
+        h_friction.addWidget(self.friction_combo)
+        layout.addLayout(h_friction)
+
+        h_audio = QHBoxLayout()
+        h_audio.addWidget(QLabel("Rate:"))
+        self.sample_rate_combo = QComboBox()
+        for rate in (44100, 48000, 96000):
+            self.sample_rate_combo.addItem(f"{rate / 1000:g} kHz", rate)
+        h_audio.addWidget(self.sample_rate_combo)
+        h_audio.addWidget(QLabel("Block:"))
+        self.blocksize_combo = QComboBox()
+        for frames in (256, 512, 1024, 2048):
+            self.blocksize_combo.addItem(str(frames), frames)
+        self.blocksize_combo.setCurrentIndex(2)
+        h_audio.addWidget(self.blocksize_combo)
+        layout.addLayout(h_audio)
+
         h2 = QHBoxLayout()
         h2.addWidget(QLabel("Vel:"))
         self.bow_vel_slider = QSlider(Qt.Orientation.Horizontal)
@@ -205,6 +240,23 @@ class Controls(QWidget):
         self.bow_force_slider.setRange(0, 100); self.bow_force_slider.setValue(50)
         h3.addWidget(self.bow_force_slider)
         layout.addLayout(h3)
+
+        h4 = QHBoxLayout()
+        h4.addWidget(QLabel("Vibrato:"))
+        self.vibrato_slider = QSlider(Qt.Orientation.Horizontal)
+        self.vibrato_slider.setRange(0, 100); self.vibrato_slider.setValue(0)
+        h4.addWidget(self.vibrato_slider)
+        layout.addLayout(h4)
+
+        h5 = QHBoxLayout()
+        h5.addWidget(QLabel("Glide:"))
+        self.portamento_slider = QSlider(Qt.Orientation.Horizontal)
+        self.portamento_slider.setRange(0, 100); self.portamento_slider.setValue(0)
+        h5.addWidget(self.portamento_slider)
+        layout.addLayout(h5)
+
+        self.sympathetic_check = QCheckBox("Sympathetic strings")
+        layout.addWidget(self.sympathetic_check)
         box.set_content_layout(layout)
 
     def setup_response_section(self, box):
@@ -233,6 +285,16 @@ class Controls(QWidget):
         self.smoothing_slider.setRange(0, 100); self.smoothing_slider.setValue(0)
         h3.addWidget(self.smoothing_slider)
         layout.addLayout(h3)
+
+        from PyQt6.QtWidgets import QPushButton
+        h4 = QHBoxLayout()
+        h4.addWidget(QLabel("Room:"))
+        self.room_button = QPushButton("Load IR...")
+        h4.addWidget(self.room_button)
+        self.room_mix_slider = QSlider(Qt.Orientation.Horizontal)
+        self.room_mix_slider.setRange(0, 100); self.room_mix_slider.setValue(30)
+        h4.addWidget(self.room_mix_slider)
+        layout.addLayout(h4)
         box.set_content_layout(layout)
 
     def setup_connections(self):
@@ -244,9 +306,17 @@ class Controls(QWidget):
         self.spl_mode_combo.currentIndexChanged.connect(self.on_spl_mode_changed)
         self.noise_slider.valueChanged.connect(self.on_noise_changed)
         self.smoothing_slider.valueChanged.connect(self.on_smoothing_changed)
+        self.room_button.clicked.connect(self.roomImpulseRequested.emit)
+        self.room_mix_slider.valueChanged.connect(self.on_room_mix_changed)
         self.excitation_combo.currentIndexChanged.connect(self.on_excitation_changed)
+        self.friction_combo.currentIndexChanged.connect(self.on_friction_changed)
+        self.sample_rate_combo.currentIndexChanged.connect(self.on_audio_settings_changed)
+        self.blocksize_combo.currentIndexChanged.connect(self.on_audio_settings_changed)
         self.bow_vel_slider.valueChanged.connect(self.on_bow_vel_changed)
         self.bow_force_slider.valueChanged.connect(self.on_bow_force_changed)
+        self.vibrato_slider.valueChanged.connect(self.on_vibrato_changed)
+        self.portamento_slider.valueChanged.connect(self.on_portamento_changed)
+        self.sympathetic_check.toggled.connect(self.sympatheticStringsChanged.emit)
         self.save_btn.clicked.connect(self.saveSettings.emit)
 
     def on_string_changed(self, index):
@@ -278,11 +348,35 @@ class Controls(QWidget):
     def on_smoothing_changed(self, value):
         self.smoothingLevelChanged.emit(value / 100.0)
 
+    def on_room_mix_changed(self, value):
+        self.roomMixChanged.emit(value / 100.0)
+
     def on_excitation_changed(self, index):
         self.excitationModeChanged.emit(self.excitation_combo.currentData())
 
+    def on_friction_changed(self, index):
+        self.frictionModelChanged.emit(self.friction_combo.currentData())
+
+    def on_audio_settings_changed(self, index):
+        self.audioSettingsChanged.emit(self.sample_rate_combo.currentData(), self.blocksize_combo.currentData())
+
+    def set_audio_settings(self, sample_rate, blocksize):
+        """Shows the given settings without emitting audioSettingsChanged."""
+        for combo, value in ((self.sample_rate_combo, sample_rate), (self.blocksize_combo, blocksize)):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(combo.findData(value))
+            combo.blockSignals(False)
+
     def on_bow_vel_changed(self, value):
         self.bowVelocityChanged.emit(value / 100.0)
 
     def on_bow_force_changed(self, value):
         self.bowForceChanged.emit(value / 100.0)
+
+    def on_vibrato_changed(self, value):
+        # Up to 1% of the frequency (about 17 cents)
+        self.vibratoChanged.emit(value / 10000.0)
+
+    def on_portamento_changed(self, value):
+        # Glide time constant up to 200 ms
+        self.portamentoChanged.emit(value / 500.0)
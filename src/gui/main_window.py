@@ -89,6 +89,12 @@ class MainWindow(QMainWindow):
         self.spectrogram_plot = SpectrogramPlot()
         self.analysis_layout.addWidget(self.spectrogram_plot, stretch=1)
         
+        # Audio callback stats overlay (top-left corner of the spectrogram)
+        self.stats_label = QLabel(self.spectrogram_plot)
+        self.stats_label.setStyleSheet("background: rgba(0, 0, 0, 160); color: #e0e0e0; font-family: monospace; font-size: 10px; padding: 3px;")
+        self.stats_label.move(6, 6)
+        self.stats_label.hide()
+        
         self.tabs.addTab(self.analysis_tab, "Acoustics")
         
         # Tab 2: Plate Map
@@ -116,6 +122,15 @@ class MainWindow(QMainWindow):
         self.start_audio_btn.clicked.connect(self.toggle_audio)
         self.btn_layout.addWidget(self.start_audio_btn)
         
+        self.record_btn = QPushButton("Record")
+        self.record_btn.setCheckable(True)
+        self.record_btn.clicked.connect(self.toggle_capture)
+        self.btn_layout.addWidget(self.record_btn)
+        
+        self.export_ir_btn = QPushButton("Export IR")
+        self.export_ir_btn.clicked.connect(self.export_impulse_response)
+        self.btn_layout.addWidget(self.export_ir_btn)
+        
         self.right_layout.addWidget(self.btn_container)
         
         self.main_layout.addWidget(self.right_panel, stretch=25)
@@ -128,14 +143,21 @@ class MainWindow(QMainWindow):
         self.arching_canvas.geometryChanged.connect(self.on_arching_changed)
         
         self.controls.materialChanged.connect(self.on_material_changed)
-        self.controls.stringFrequencyChanged.connect(self.synthesizer.set_frequency)
+        self.controls.stringFrequencyChanged.connect(self.on_string_frequency_changed)
         self.controls.splModeChanged.connect(self.on_spl_mode_changed)
         self.controls.noiseLevelChanged.connect(self.on_noise_level_changed)
         self.controls.smoothingLevelChanged.connect(self.on_smoothing_level_changed)
         
         self.controls.excitationModeChanged.connect(self.synthesizer.set_excitation_type)
+        self.controls.frictionModelChanged.connect(self.synthesizer.set_friction_model)
+        self.controls.roomImpulseRequested.connect(self.on_load_room_impulse)
+        self.controls.roomMixChanged.connect(self.synthesizer.set_room_mix)
+        self.controls.audioSettingsChanged.connect(self.on_audio_settings_changed)
         self.controls.bowVelocityChanged.connect(self.on_bow_params_changed)
         self.controls.bowForceChanged.connect(self.on_bow_params_changed)
+        self.controls.vibratoChanged.connect(self.synthesizer.set_vibrato)
+        self.controls.portamentoChanged.connect(self.synthesizer.set_portamento)
+        self.controls.sympatheticStringsChanged.connect(self.synthesizer.set_sympathetic_strings)
         
         self.controls.saveSettings.connect(self.on_save_default_geometry)
         
@@ -158,13 +180,87 @@ class MainWindow(QMainWindow):
         self.spectrogram_timer = QTimer()
         self.spectrogram_timer.timeout.connect(self.update_spectrogram)
         self.spectrogram_timer.start(30) # 30ms ~ 33fps
+        
+        # Stats Overlay Timer
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.update_stats_overlay)
+        self.stats_timer.start(500)
 
     def update_spectrogram(self):
         if self.synthesizer.is_running:
-            chunk = self.synthesizer.get_audio_chunk()
-            if chunk is not None:
-                self.spectrogram_plot.update_plot(chunk)
+            samples, dropped = self.synthesizer.read_audio_tap()
+            if len(samples) or dropped:
+                self.spectrogram_plot.update_stream(samples, dropped)
                 
+    def on_audio_settings_changed(self, sample_rate, blocksize):
+        from PyQt6.QtWidgets import QMessageBox
+        try:
+            self.synthesizer.configure(sample_rate, blocksize)
+        except Exception as e:
+            QMessageBox.warning(self, "Audio Settings", str(e))
+            self.controls.set_audio_settings(self.synthesizer.sample_rate, self.synthesizer.blocksize)
+            return
+        self.spectrogram_plot.configure(self.synthesizer.sample_rate, self.synthesizer.blocksize)
+
+    def export_impulse_response(self):
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        from ..core.impulse import export_impulse_response
+        modes = self.physics.predict()
+        if not modes:
+            QMessageBox.warning(self, "Export IR", "No body modes: draw an outline first.")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Body Impulse Response", "", "WAV files (*.wav);;NumPy files (*.npy)")
+        if not file_name:
+            return
+        try:
+            sample_rate = self.synthesizer.sample_rate
+            export_impulse_response(self.physics.impulse_response(modes, sample_rate), file_name, sample_rate)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export impulse response: {e}")
+
+    def on_load_room_impulse(self):
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open Room Impulse Response", "", "WAV files (*.wav)")
+        if not file_name:
+            return
+        try:
+            self.synthesizer.load_room_impulse(file_name)
+            self.controls.room_button.setText(os.path.basename(file_name))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load impulse response: {e}")
+
+    def on_string_frequency_changed(self, value):
+        if isinstance(value, dict):
+            self.synthesizer.set_chord(value["chord"])
+        else:
+            self.synthesizer.set_frequency(value)
+
+    def update_stats_overlay(self):
+        if not self.synthesizer.is_running:
+            self.stats_label.hide()
+            return
+        st = self.synthesizer.stats()
+        total, load = st["total_us"], st["load_percent"]
+        stages = "  ".join(f"{name} {h['p99'] / 1000.0:.2f}" for name, h in st["stages_us"].items() if h["count"])
+        xruns = sum(st["xruns"].values())
+        quality = st["excitation_quality"].get(self.synthesizer.params.excitation_type, 0)
+        capture = st["capture"]
+        if capture and capture["error"]:
+            # The writer stopped: close the file and report it
+            self.record_btn.setChecked(False)
+            self.toggle_capture(False)
+            capture = None
+        recording = f"\nrecording {capture['seconds']:.1f} s  dropped {capture['dropped']}" if capture else ""
+        self.stats_label.setText(
+            f"callback p50 {total['p50'] / 1000.0:.2f} ms  p99 {total['p99'] / 1000.0:.2f} ms  max {total['max'] / 1000.0:.2f} ms\n"
+            f"deadline load p99 {load['p99']:.0f}%  max {load['max']:.0f}%  misses {st['deadline_misses']}  xruns {xruns}\n"
+            f"excitation quality {quality} ({st['quality_changes']} changes)\n"
+            f"p99 [ms]: {stages}{recording}"
+        )
+        self.stats_label.adjustSize()
+        self.stats_label.show()
+        self.stats_label.raise_()
+
     def on_arching_changed(self, points):
         # points is already a list of QPointF from the signal
         from ..core.geometry import Point
@@ -302,6 +398,29 @@ class MainWindow(QMainWindow):
             self.synthesizer.stop()
             self.start_audio_btn.setText("Start Audio")
 
+    def toggle_capture(self, checked):
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        if not checked:
+            capture = self.synthesizer.stop_capture()
+            self.record_btn.setText("Record")
+            if capture is not None and capture.error is not None:
+                QMessageBox.critical(self, "Recording", f"Recording stopped after {capture.seconds:.1f} s: {capture.error}")
+            elif capture is not None and capture.dropped:
+                QMessageBox.warning(self, "Recording", f"{capture.dropped} samples were lost to buffer overflows "
+                                    f"({capture.overflows} times) and written as silence.")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Record Output", "", "WAV files (*.wav);;FLAC files (*.flac)")
+        if not file_name:
+            self.record_btn.setChecked(False)
+            return
+        try:
+            self.synthesizer.start_capture(file_name)
+            self.record_btn.setText("Stop Rec")
+        except Exception as e:
+            self.record_btn.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Failed to start recording: {e}")
+
     def closeEvent(self, event):
+        self.synthesizer.stop_capture()
         self.synthesizer.stop()
         super().closeEvent(event)
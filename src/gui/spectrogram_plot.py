@@ -3,6 +3,8 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
 
+from ..core import fft
+
 class SpectrogramPlot(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -27,9 +29,13 @@ class SpectrogramPlot(QWidget):
         
         # Buffer for scrolling spectrogram
         self.buffer_size = 100
-        self.n_fft_bins = 513 # Match blocksize=1024
+        self.n_fft_bins = 513 # Match blocksize=1024 (see configure)
         self.spectrogram_data = np.zeros((self.n_fft_bins, self.buffer_size))
         
+        # Streaming input: samples left over from the last read, drop counter
+        self.pending = np.zeros(0)
+        self.dropped_total = 0
+        
         # Image
         self.im = self.ax.imshow(
             self.spectrogram_data, 
@@ -41,28 +47,43 @@ class SpectrogramPlot(QWidget):
         
         self.ax.set_ylim(0, 5000) 
 
+    def configure(self, sample_rate, blocksize):
+        """Follows the synthesizer settings: one FFT frame per block, frequency axis up to Nyquist."""
+        self.n_fft_bins = blocksize // 2 + 1
+        self.spectrogram_data = np.zeros((self.n_fft_bins, self.buffer_size))
+        self.pending = np.zeros(0)
+        self.im.set_data(self.spectrogram_data)
+        self.im.set_extent([0, self.buffer_size, 0, sample_rate / 2])
+        self.ax.set_ylim(0, min(5000, sample_rate / 2))
+        self.canvas.draw()
 
-    def update_plot(self, audio_chunk, fundamental_freq=None):
-        if audio_chunk is None: return
-            
-        window = np.hanning(len(audio_chunk))
-        spectrum = np.fft.rfft(audio_chunk * window)
-        magnitude = np.abs(spectrum)
+    def update_stream(self, samples, dropped=0):
+        """
+        Appends everything read from the audio tap since the last update,
+        one column per full FFT frame, and redraws once.
+        """
+        n_fft = 2 * (self.n_fft_bins - 1)
+        if dropped:
+            # Frames were lost: don't splice across the gap
+            self.dropped_total += dropped
+            self.pending = np.zeros(0)
+            self.ax.set_title(f"Real-time Spectrogram (dropped {self.dropped_total} samples)")
+        
+        data = np.concatenate([self.pending, samples])
+        n_frames = len(data) // n_fft
+        self.pending = data[n_frames * n_fft:]
+        if n_frames == 0:
+            return
         
-        # Log scale
-        magnitude = 20 * np.log10(np.maximum(magnitude, 1e-9))
+        # Only the newest columns that fit on screen
+        n_frames = min(n_frames, self.buffer_size)
+        frames = data[:len(data) - len(self.pending)].reshape(-1, n_fft)[-n_frames:]
+        spectrum = fft.rfft(frames * np.hanning(n_fft), axis=1)
+        magnitude = 20 * np.log10(np.maximum(np.abs(spectrum), 1e-9))
         
-        # Roll buffer
-        self.spectrogram_data = np.roll(self.spectrogram_data, -1, axis=1)
+        self.spectrogram_data = np.roll(self.spectrogram_data, -n_frames, axis=1)
+        self.spectrogram_data[:, -n_frames:] = magnitude.T
         
-        # Update last column
-        if len(magnitude) == self.n_fft_bins:
-             self.spectrogram_data[:, -1] = magnitude
-        else:
-            self.n_fft_bins = len(magnitude)
-            self.spectrogram_data = np.zeros((self.n_fft_bins, self.buffer_size))
-            self.spectrogram_data[:, -1] = magnitude
-            
         self.im.set_data(self.spectrogram_data)
         self.im.set_clim(-80, -20)
         self.canvas.draw()